@@ -0,0 +1,592 @@
+# -*- coding: utf-8 -*-
+"""
+Platcorn NewsBot – ölçüm betikleri (ağ yok, Telegram/Google çağrısı yok)
+
+  python bench.py text [-n 5000]   # çeviri öncesi/sonrası metin işleme, haber başına maliyet
+  python bench.py replay [--feeds 34 340 3400] [--fixtures DIR] [--cycles 2]
+                                   # run_once uçtan uca: giriş/sn, aşama süreleri, tepe bellek
+  python bench.py soak [--cycles 200] [--fixtures DIR]
+                                   # uzun süreç: her koşuda yeni girişler, koşu başına RSS büyümesi
+  python bench.py record DIR       # canlı feed + makaleleri replay fixture'ı olarak kaydet (ağ gerekir)
+  python bench.py startup [-n 5]   # 'import main' süresi + açılışta yüklenen ağır modüller
+
+--fixtures verilmezse sentetik fixture'lar kullanılır. Depoda küçük bir kayıt var:
+tests/fixtures/replay (3 feed: RSS, Türkçe RSS, Atom; 10 makale, 'record' biçiminde);
+kayıt yolunu ölçmek için: python bench.py replay --fixtures tests/fixtures/replay
+"""
+
+import argparse, email.utils, gc, html, json, os, random, re, shutil, statistics, subprocess, sys
+import tempfile, threading, time, tracemalloc
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import resource   # tepe RSS (Linux/macOS)
+except ImportError:
+    resource = None
+
+import main
+
+# =======================
+# METİN İŞLEME (çeviri hariç)
+# =======================
+
+SAMPLE_TITLES = [
+    "MrBeast leaks $5M deal with YouTube after Kai Cenat quits Twitch",
+    "xQc slammed for ditching Kick stream, claims Rumble would make $100K",
+    "Pokimane reveals new agency as Twitch shuts down partner program",
+    "Dr Disrespect returns: Asmongold and HasanAbi react to the “comeback”",
+]
+
+SAMPLE_SUMMARIES = [
+    "iShowSpeed’s latest stream pulled 1.2M viewers. Ninja said the 3B view milestone "
+    "was unreal. Ludwig and Valkyrae joined the 10K sub goal with Shroud and Amouranth.",
+    "Platcorn sources say the $2.5B creator economy keeps growing. YouTube paid 40M "
+    "to creators while Twitch lost 500K streamers in a single year.",
+]
+
+# --- eski uygulama: her çağrıda sıralama + satır içi re.sub (karşılaştırma referansı) ---
+
+def legacy_pretranslate_en(s):
+    if not s: return s
+    s = re.sub(r"\$?(\d+(\.\d+)?)\s?B\b", r"\1 billion", s, flags=re.IGNORECASE)
+    s = re.sub(r"\$?(\d+(\.\d+)?)\s?M\b", r"\1 million", s, flags=re.IGNORECASE)
+    s = re.sub(r"\$?(\d+(\.\d+)?)\s?K\b", r"\1 thousand", s, flags=re.IGNORECASE)
+    s = s.replace("’","'").replace("“","\"").replace("”","\"")
+    return s
+
+def legacy_postprocess_money_tr(s):
+    s = re.sub(r"\b([0-9]+(?:[.,][0-9]+)?)\s*million\b", r"\1 milyon", s, flags=re.IGNORECASE)
+    s = re.sub(r"\b([0-9]+(?:[.,][0-9]+)?)\s*billion\b", r"\1 milyar", s, flags=re.IGNORECASE)
+    s = re.sub(r"\b([0-9]+(?:[.,][0-9]+)?)\s*thousand\b", r"\1 bin", s, flags=re.IGNORECASE)
+    s = re.sub(r"\$\s*([0-9])", r"$\1", s)
+    return s
+
+def legacy_polish_title_tr(tr):
+    if not tr: return tr
+    t = tr
+    for pat, rep in main.TITLE_VERB_MAP:
+        t = re.sub(pat, rep, t, flags=re.IGNORECASE)
+    t = re.sub(r"\s+", " ", t).strip()
+    if t and not t.endswith(('.', '!', '?')):
+        t = t[0].upper() + t[1:]
+    return t
+
+def legacy_process(text, is_title):
+    placeholders = {}
+    safe = text
+    for i, name in enumerate(sorted(main.PROPER_NOUNS, key=len, reverse=True)):
+        key = f"__PN{i}__"
+        placeholders[key] = name
+        safe = re.sub(rf"\b{name}\b", key, safe, flags=re.IGNORECASE)
+    safe = re.sub(r"\s+", " ", legacy_pretranslate_en(safe)).strip()
+    tr = safe   # çeviri yerine birebir (sadece metin işleme ölçülür)
+    for key, name in placeholders.items():
+        tr = tr.replace(key, name)
+    tr = legacy_postprocess_money_tr(tr)
+    if is_title:
+        tr = legacy_polish_title_tr(tr)
+    return tr
+
+def pipeline_process(text, is_title):
+    safe, placeholders = main.TEXT_PIPELINE.prepare(text)
+    return main.TEXT_PIPELINE.finish(safe, placeholders, is_title)
+
+def bench_text(n: int):
+    items = [(t, True) for t in SAMPLE_TITLES] + [(s, False) for s in SAMPLE_SUMMARIES]
+    for text, is_title in items:
+        old, new = legacy_process(text, is_title), pipeline_process(text, is_title)
+        if old != new:
+            raise SystemExit(f"Çıktı farklı:\n  eski: {old}\n  yeni: {new}")
+
+    results = {}
+    for name, fn in (("eski", legacy_process), ("derlenmiş", pipeline_process)):
+        re.purge()   # eski yol re modülünün desen önbelleğinden faydalanmasın
+        t0 = time.perf_counter()
+        for _ in range(n):
+            for text, is_title in items:
+                fn(text, is_title)
+        results[name] = (time.perf_counter() - t0) / (n * len(items))
+
+    for name, per_item in results.items():
+        print(f"{name:>10}: {per_item * 1e6:8.1f} µs/haber")
+    print(f"{'hızlanma':>10}: {results['eski'] / results['derlenmiş']:8.1f}x")
+
+# =======================
+# TEKRAR OYNATMA (run_once uçtan uca, ağ yok)
+# =======================
+# Feed XML ve makale HTML'i yerel bir HTTP sunucusundan verilir (kayıtlı fixture ya
+# da sentetik); çeviri main'in "offline" arka ucuyla, Telegram sendMessage yerel bir
+# taklitle yapılır (ikisinin de gecikmesi ayarlanabilir). run_once'ın kendisi (eşzamanlı
+# feed indirme, dedupe, makale çıkarma, özet süreç havuzu, toplu çeviri, gönderim
+# kuyruğu, sqlite) değişmeden çalışır.
+# Tüm fixture'lar tek host'tan verildiği için host başı sınır --per-host ile ayarlanır.
+# Fixture'ların epoch'u artırılınca feed'ler yeni link/ETag ile döner (soak koşuları).
+
+_SYLLABLES = ("ka", "lo", "mi", "ra", "ve", "zu", "po", "ne", "ti", "so")
+_ENDINGS   = ("rin", "tan", "vel", "mos", "dak", "lix", "pen", "gor", "sum", "fay")
+SYN_WORDS  = [a + b for a in _SYLLABLES for b in _ENDINGS]   # anlamsız ama tekil kelimeler
+SYN_CORE   = ("MrBeast", "Twitch", "YouTube", "Kick", "xQc", "Pokimane", "TikTok", "Ludwig")
+SYN_GLOBAL = ("stream", "creator", "viewers", "partner", "monetization", "platform", "controversy")
+
+class SyntheticFixtures:
+    """
+    Feed i ve makaleler istek anında, tohumdan deterministik üretilir (binlerce feed
+    bellekte tutulmaz). Başlıklar CORE + GLOBAL keyword içerir ve birbirine benzemez,
+    böylece girişler keyword/yakın-kopya aşamalarından geçip makale çekmeye ulaşır.
+    epoch > 0 ise başlıklar ve linkler de epoch'a göre değişir (her koşuda yeni haberler).
+    """
+
+    def __init__(self, items: int, seed: int = 1):
+        self.items = items
+        self.seed = seed
+        self.epoch = 0
+
+    def category(self, i: int, categories):
+        return categories[i % len(categories)]
+
+    def _title(self, rng) -> str:
+        words = " ".join(rng.sample(SYN_WORDS, 6))
+        return f"{rng.choice(SYN_CORE)} {rng.choice(SYN_GLOBAL)} {words}"
+
+    def feed(self, i: int, base: str) -> bytes:
+        rng = random.Random(f"{self.seed}:{self.epoch}:{i}" if self.epoch else f"{self.seed}:{i}")
+        prefix = f"{self.epoch}." if self.epoch else ""
+        now = time.time()
+        items = []
+        for j in range(self.items):
+            items.append(
+                f"<item><title>{html.escape(self._title(rng))}</title>"
+                f"<link>{base}/a/{prefix}{i}-{j}</link>"
+                f"<pubDate>{email.utils.formatdate(now - 60 * j - 30)}</pubDate>"
+                f"<description>synthetic</description></item>"
+            )
+        return (f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+                f"<title>bench {i}</title>{''.join(items)}</channel></rss>").encode("utf-8")
+
+    def article(self, key: str, base: str) -> bytes:
+        rng = random.Random(f"{self.seed}:a:{key}")
+        paras = []
+        for _ in range(10):
+            sents = (" ".join(rng.choices(SYN_WORDS, k=rng.randint(12, 20))).capitalize() + "."
+                     for _ in range(3))
+            paras.append(f"<p>{' '.join(sents)}</p>")
+        return (f"<html><head><title>{key}</title>"
+                f"<link rel='canonical' href='{base}/a/{key}'></head><body>"
+                f"<nav><a href='/'>home</a></nav><article>{''.join(paras)}</article>"
+                f"<footer>footer</footer></body></html>").encode("utf-8")
+
+RECORDED_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "fixtures", "replay")
+
+class RecordedFixtures:
+    """
+    bench.py record çıktısı: DIR/index.json + feeds/*.xml + articles/*.html
+    (depodaki örnek: RECORDED_FIXTURES).
+    Feed sayısı kayıttan fazlaysa kayıt kopyalanır; kopyaların linkleri tekil olur
+    (aynı başlıklar yayıncılar arası yakın-kopya olarak elenir — dedupe yolu da ölçülür).
+    Yayın tarihleri servis anına çekilir, aksi halde hepsi tazelik kapısında elenir.
+    epoch linklere eklenir; başlıklar aynı kaldığı için sonraki epoch'lar başlık
+    dedupe'unda elenir (soak'ta ayrıştırma + dedupe yolu ölçülür).
+    """
+
+    _DATE_TAGS = re.compile(r"<(pubDate|published|updated|dc:date)>[^<]*</\1>")
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        self.feeds = index["feeds"]            # [{"url", "category", "file"}]
+        self.articles = index["articles"]      # {orijinal URL: dosya adı (uzantısız)}
+        self._xml = {}
+        self.epoch = 0
+
+    def category(self, i: int, categories):
+        cat = self.feeds[i % len(self.feeds)].get("category")
+        return cat if cat in categories else categories[i % len(categories)]
+
+    def feed(self, i: int, base: str) -> bytes:
+        spec = self.feeds[i % len(self.feeds)]
+        xml = self._xml.get(spec["file"])
+        if xml is None:
+            with open(os.path.join(self.path, "feeds", spec["file"]), encoding="utf-8") as f:
+                xml = self._xml[spec["file"]] = f.read()
+        copy = i // len(self.feeds)
+        prefix = f"{self.epoch}." if self.epoch else ""
+        for url, name in self.articles.items():
+            local = f"{base}/a/{prefix}{copy}-{name}"
+            xml = xml.replace(html.escape(url), local).replace(url, local)
+        now, n = time.time(), iter(range(10_000))
+        def fresh_date(m):
+            ts = now - 60 * next(n) - 30
+            if m.group(1) == "pubDate":
+                return f"<pubDate>{email.utils.formatdate(ts)}</pubDate>"
+            return f"<{m.group(1)}>{time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(ts))}</{m.group(1)}>"
+        return self._DATE_TAGS.sub(fresh_date, xml).encode("utf-8")
+
+    def article(self, key: str, base: str) -> bytes:
+        name = key.split("-", 1)[-1]
+        try:
+            with open(os.path.join(self.path, "articles", f"{name}.html"), "rb") as f:
+                return f.read()
+        except OSError:
+            return b""
+
+class ReplayServer:
+    """Feed, makale ve Telegram sendMessage taklidi (ayarlanabilir gecikmeli)."""
+
+    def __init__(self, fixtures, feed_latency=0.0, article_latency=0.0, tg_latency=0.0):
+        self.fixtures = fixtures
+        self.feed_latency = feed_latency
+        self.article_latency = article_latency
+        self.tg_latency = tg_latency
+        self.tg_messages = 0
+        self.tg_fail = set()     # bu chat_id'lere sendMessage 502 döner (teslim hatası taklidi)
+        self.tg_reject = set()   # bu chat_id'lere 403 döner (bot engellendi/kanaldan atıldı)
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, name="replay", daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        srv = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive (gerçek sunucular gibi)
+            disable_nagle_algorithm = True  # başlık + gövde ayrı yazılınca 40 ms ACK beklemesi olmasın
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, code, body=b"", ctype="text/plain", etag=None):
+                self.send_response(code)
+                self.send_header("Content-Type", ctype)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith("/feed/"):
+                    time.sleep(srv.feed_latency)
+                    etag = f'"v{srv.fixtures.epoch + 1}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        return self.reply(304)
+                    body = srv.fixtures.feed(int(self.path[6:]), srv.base)
+                    return self.reply(200, body, "application/rss+xml; charset=utf-8", etag)
+                if self.path.startswith("/a/"):
+                    time.sleep(srv.article_latency)
+                    body = srv.fixtures.article(self.path[3:], srv.base)
+                    return self.reply(200 if body else 404, body, "text/html; charset=utf-8", '"v1"')
+                self.reply(404)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not self.path.endswith("/sendMessage"):
+                    return self.reply(404)
+                time.sleep(srv.tg_latency)
+                chat_id = str(json.loads(body or b"{}").get("chat_id"))
+                if chat_id in srv.tg_fail:
+                    return self.reply(502, b'{"ok":false}', "application/json")
+                if chat_id in srv.tg_reject:
+                    return self.reply(403, b'{"ok":false,"error_code":403}', "application/json")
+                with srv.lock:
+                    srv.tg_messages += 1
+                self.reply(200, b'{"ok":true,"result":{}}', "application/json")
+
+        return Handler
+
+_REPLAY_PATCHED = ("APP_DIR", "DB_PATH", "METRICS_PROM_PATH", "METRICS_JSON_PATH", "METRICS",
+                   "CATEGORIES", "TRANSLATE_BACKEND", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID",
+                   "TELEGRAM_API_BASE", "FEED_PER_HOST_LIMIT", "normalize_link")
+
+@contextmanager
+def replay_env(server, n_feeds: int, per_host: int):
+    """main modülünü geçici veritabanı + yerel sunucuya yönlendirir; çıkışta geri alır."""
+    saved = {name: getattr(main, name) for name in _REPLAY_PATCHED}
+    saved_hc = os.environ.pop("HEALTHCHECK_URL", None)
+    tmp = tempfile.mkdtemp(prefix="newsbot-bench-")
+    categories = list(main.CATEGORIES)
+    feeds = {cat: [] for cat in categories}
+    for i in range(n_feeds):
+        feeds[server.fixtures.category(i, categories)].append(f"{server.base}/feed/{i}")
+    main.close_db()
+    main.APP_DIR = tmp
+    main.DB_PATH = os.path.join(tmp, "seen.db")
+    main.METRICS_PROM_PATH = os.path.join(tmp, "metrics.prom")
+    main.METRICS_JSON_PATH = os.path.join(tmp, "last_cycle.json")
+    main.CATEGORIES = {cat: {**spec, "feeds": feeds[cat]} for cat, spec in saved["CATEGORIES"].items()}
+    main.TRANSLATE_BACKEND = "offline"
+    main.TELEGRAM_BOT_TOKEN, main.TELEGRAM_CHAT_ID = "bench", "0"
+    main.TELEGRAM_API_BASE = server.base
+    main.FEED_PER_HOST_LIMIT = per_host
+    main._host_slots.clear()
+    # normalize_link http'yi https'e çevirir; yerel sunucu TLS'siz olduğu için geri alınır
+    normalize, https_base = saved["normalize_link"], "https" + server.base[4:]
+    main.normalize_link = lambda url: normalize(url).replace(https_base, server.base, 1)
+    try:
+        yield tmp
+    finally:
+        main.close_tg_deliveries()
+        main.shutdown_summary_pool()
+        main.close_db()
+        main._host_slots.clear()
+        for name, value in saved.items():
+            setattr(main, name, value)
+        if saved_hc is not None:
+            os.environ["HEALTHCHECK_URL"] = saved_hc
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def histogram_stats(metrics, name: str) -> dict:
+    """{etiket: (adet, ortalama sn, ~p95 sn)} — p95 kova üst sınırından."""
+    out = {}
+    for (hname, labels), h in metrics.hists.items():
+        if hname != name or not h[-1]:
+            continue
+        count, total = h[-1], h[-2]
+        p95 = next((b for b, n in zip(metrics.buckets, h) if n >= 0.95 * count), float("inf"))
+        out[",".join(v for _, v in labels)] = (count, total / count, p95)
+    return out
+
+def peak_rss_mb():
+    if resource is None:
+        return None, None
+    scale = 1024 * 1024 if os.uname().sysname == "Darwin" else 1024   # macOS bayt, Linux KB
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 / scale / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024 / scale / 1024
+    return own, children
+
+def current_rss_mb():
+    """Anlık RSS (Linux /proc); yoksa None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+def replay_cycle(trace: bool) -> dict:
+    main.METRICS = main.Metrics()   # histogramlar sadece bu koşuyu içersin
+    if trace:
+        tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    main.run_once()
+    wall = time.perf_counter() - t0
+    with open(main.METRICS_JSON_PATH, encoding="utf-8") as f:
+        summary = json.load(f)
+    return {
+        "wall_s": round(wall, 3),
+        "entries_per_s": round(summary["entries"] / wall, 1) if wall else None,
+        "sent_per_s": round(summary["sent"] / wall, 1) if wall else None,
+        "summary": {k: summary[k] for k in ("feeds", "feeds_unchanged", "feed_errors", "entries",
+                                            "fresh", "candidates", "sent", "dropped")},
+        "stage_seconds": summary["stage_seconds"],
+        "calls": {k: {"n": n, "mean_ms": round(m * 1000, 1), "p95_ms": p95 * 1000}
+                  for k, (n, m, p95) in sorted(histogram_stats(main.METRICS, "newsbot_call_seconds").items())},
+        "py_peak_mb": round(tracemalloc.get_traced_memory()[1] / 2**20, 1) if trace else None,
+    }
+
+def print_cycle(n_feeds: int, cycle: int, r: dict):
+    s = r["summary"]
+    print(f"\nfeed={n_feeds} koşu={cycle}: {r['wall_s']:.2f} sn | giriş {s['entries']} "
+          f"({r['entries_per_s']}/sn) aday {s['candidates']} gönderilen {s['sent']} ({r['sent_per_s']}/sn) "
+          f"| değişmeyen feed {s['feeds_unchanged']}/{s['feeds']} hata {s['feed_errors']}")
+    if s["dropped"]:
+        print("  elenen: " + " ".join(f"{k}={v}" for k, v in s["dropped"].items()))
+    print("  aşama (sn): " + " ".join(f"{k}={v:.3f}" for k, v in r["stage_seconds"].items()))
+    for call, c in r["calls"].items():
+        print(f"  {call:>17}: {c['n']:6d} çağrı  ort {c['mean_ms']:8.1f} ms  p95 ≤{c['p95_ms']:g} ms")
+    rss, child = r["rss_mb"]
+    mem = f"tepe RSS {rss:.0f} MB (özet süreçleri {child:.0f} MB)" if rss is not None else "tepe RSS ölçülemedi"
+    if r["py_peak_mb"] is not None:
+        mem += f" | Python yığını tepe {r['py_peak_mb']} MB (tracemalloc)"
+    print("  bellek: " + mem)
+
+def bench_replay(args):
+    fixtures = (RecordedFixtures(args.fixtures) if args.fixtures
+                else SyntheticFixtures(args.items, args.seed))
+    main.OfflineTranslateBackend.latency = args.translate_latency
+    server = ReplayServer(fixtures, args.feed_latency, args.article_latency, args.tg_latency)
+    if args.tracemalloc:
+        tracemalloc.start()
+    results = []
+    try:
+        for n_feeds in sorted(args.feeds):
+            with replay_env(server, n_feeds, args.per_host):
+                for cycle in range(1, args.cycles + 1):
+                    r = replay_cycle(args.tracemalloc)
+                    r["rss_mb"] = peak_rss_mb()   # süreç boyu tepe (boyutlar artan sırada)
+                    r.update(feeds=n_feeds, cycle=cycle)
+                    print_cycle(n_feeds, cycle, r)
+                    results.append(r)
+    finally:
+        server.close()
+        if args.tracemalloc:
+            tracemalloc.stop()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+
+def bench_soak(args) -> int:
+    """
+    Tek süreçte art arda --cycles koşu (sürekli mod gibi); her koşuda fixture epoch'u
+    artar, feed'ler yeni girişlerle döner. Her koşudan sonra gc + anlık RSS (ve
+    --tracemalloc ile Python yığını) kaydedilir. Koşuların ikinci yarısındaki RSS
+    büyümesi --max-growth-mb'yi aşarsa çıkış kodu 1 döner.
+    """
+    fixtures = (RecordedFixtures(args.fixtures) if args.fixtures
+                else SyntheticFixtures(args.items, args.seed))
+    main.OfflineTranslateBackend.latency = args.translate_latency
+    server = ReplayServer(fixtures)
+    if args.tracemalloc:
+        tracemalloc.start()
+    rss = []
+    try:
+        with replay_env(server, args.feeds, args.per_host):
+            for cycle in range(1, args.cycles + 1):
+                fixtures.epoch = cycle
+                r = replay_cycle(False)
+                gc.collect()
+                mb = current_rss_mb()
+                if mb is None:
+                    mb = peak_rss_mb()[0]
+                rss.append(mb)
+                s = r["summary"]
+                line = (f"koşu {cycle:4d}: {r['wall_s']:6.2f} sn | giriş {s['entries']:5d} "
+                        f"aday {s['candidates']:4d} gönderilen {s['sent']:4d} | RSS {mb:.1f} MB")
+                if args.tracemalloc:
+                    line += f" | Python yığını {tracemalloc.get_traced_memory()[0] / 2**20:.1f} MB"
+                print(line)
+    finally:
+        server.close()
+        if args.tracemalloc:
+            tracemalloc.stop()
+    second = rss[len(rss) // 2:]
+    growth = second[-1] - second[0] if len(second) > 1 else 0.0
+    print(f"\nRSS: ilk {rss[0]:.1f} MB, son {rss[-1]:.1f} MB, en çok {max(rss):.1f} MB | "
+          f"ikinci yarıda büyüme {growth:+.1f} MB (sınır {args.max_growth_mb} MB)")
+    if growth > args.max_growth_mb:
+        print("UYARI: bellek koşu sayısıyla büyüyor")
+        return 1
+    return 0
+
+def record_fixtures(out_dir: str):
+    """CATEGORIES'teki feed'leri ve ilk MAX_ITEMS_PER_FEED makalesini diske yazar."""
+    os.makedirs(os.path.join(out_dir, "feeds"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "articles"), exist_ok=True)
+    index = {"recorded": int(time.time()), "feeds": [], "articles": {}}
+    for n, (url, category) in enumerate(main.build_feed_catalog().items()):
+        try:
+            r = main.http_session().get(url, timeout=main.FEED_TIMEOUT_SECONDS)
+            r.raise_for_status()
+        except Exception as e:
+            print(f"atlandı: {url} -> {e}")
+            continue
+        name = f"{n:03d}.xml"
+        with open(os.path.join(out_dir, "feeds", name), "wb") as f:
+            f.write(r.content)
+        index["feeds"].append({"url": url, "category": category, "file": name})
+        for e in main.feedparser.parse(r.content).entries[:main.MAX_ITEMS_PER_FEED]:
+            link = getattr(e, "link", "")
+            if not link or link in index["articles"]:
+                continue
+            try:
+                data = main.download_html(link)[0]
+            except Exception as ex:
+                print(f"makale atlandı: {link} -> {ex}")
+                continue
+            art = f"{len(index['articles']):05d}"
+            with open(os.path.join(out_dir, "articles", f"{art}.html"), "wb") as f:
+                f.write(data or b"")
+            index["articles"][link] = art
+        print(f"{url}: kaydedildi")
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    print(f"{len(index['feeds'])} feed, {len(index['articles'])} makale -> {out_dir}")
+
+# =======================
+# AÇILIŞ SÜRESİ
+# =======================
+
+HEAVY_MODULES = ("deep_translator", "sumy", "nltk", "newspaper", "lxml")
+
+_STARTUP_PROBE = (
+    "import json, sys, time; t = time.perf_counter(); import main; "
+    "print(json.dumps([time.perf_counter() - t, [m for m in %r if m in sys.modules]]))"
+)
+
+def bench_startup(n: int):
+    """Her ölçüm temiz bir süreçte (modül önbelleği yok, cron koşusu gibi)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    times, loaded = [], []
+    for _ in range(n):
+        out = subprocess.run([sys.executable, "-c", _STARTUP_PROBE % (HEAVY_MODULES,)],
+                             cwd=here, capture_output=True, text=True, check=True).stdout
+        secs, loaded = json.loads(out.strip().splitlines()[-1])
+        times.append(secs)
+    print(f"import main: medyan {statistics.median(times) * 1000:.0f} ms "
+          f"(en az {min(times) * 1000:.0f}, en çok {max(times) * 1000:.0f}; {n} süreç)")
+    print("açılışta yüklenen ağır modüller: " + (", ".join(loaded) or "yok"))
+
+# =======================
+# GİRİŞ
+# =======================
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Platcorn NewsBot ölçümleri")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_text = sub.add_parser("text", help="çeviri öncesi/sonrası metin işleme mikro-ölçümü")
+    p_text.add_argument("-n", type=int, default=5000, help="tekrar sayısı")
+
+    p_replay = sub.add_parser("replay", help="fixture'larla run_once uçtan uca (ağ yok)")
+    p_replay.add_argument("--feeds", type=int, nargs="+", default=[34], help="feed sayıları (ör. 34 340 3400)")
+    p_replay.add_argument("--fixtures", help="bench.py record dizini, ör. tests/fixtures/replay (verilmezse sentetik)")
+    p_replay.add_argument("--items", type=int, default=main.MAX_ITEMS_PER_FEED, help="sentetik feed başına giriş")
+    p_replay.add_argument("--seed", type=int, default=1)
+    p_replay.add_argument("--cycles", type=int, default=2, help="boyut başına koşu (2.si 304/önbellekli)")
+    p_replay.add_argument("--feed-latency", type=float, default=0.05, help="feed yanıt gecikmesi (sn)")
+    p_replay.add_argument("--article-latency", type=float, default=0.05, help="makale yanıt gecikmesi (sn)")
+    p_replay.add_argument("--translate-latency", type=float, default=0.2, help="çeviri isteği gecikmesi (sn)")
+    p_replay.add_argument("--tg-latency", type=float, default=0.03, help="Telegram sendMessage gecikmesi (sn)")
+    p_replay.add_argument("--per-host", type=int, default=main.FEED_FETCH_WORKERS,
+                          help="host başı eşzamanlı istek (fixture'lar tek host'ta)")
+    p_replay.add_argument("--tracemalloc", action="store_true", help="Python yığını tepe bellek (yavaşlatır)")
+    p_replay.add_argument("--json", help="sonuçları bu dosyaya yaz (regresyon karşılaştırması)")
+
+    p_soak = sub.add_parser("soak", help="uzun süreçte bellek büyümesi (her koşuda yeni girişler)")
+    p_soak.add_argument("--cycles", type=int, default=200)
+    p_soak.add_argument("--feeds", type=int, default=34, help="feed sayısı")
+    p_soak.add_argument("--fixtures", help="bench.py record dizini, ör. tests/fixtures/replay (verilmezse sentetik)")
+    p_soak.add_argument("--items", type=int, default=20, help="sentetik feed başına giriş")
+    p_soak.add_argument("--seed", type=int, default=1)
+    p_soak.add_argument("--translate-latency", type=float, default=0.0, help="çeviri isteği gecikmesi (sn)")
+    p_soak.add_argument("--per-host", type=int, default=main.FEED_FETCH_WORKERS,
+                        help="host başı eşzamanlı istek (fixture'lar tek host'ta)")
+    p_soak.add_argument("--max-growth-mb", type=float, default=20.0,
+                        help="ikinci yarıda izin verilen RSS büyümesi; aşılırsa çıkış kodu 1")
+    p_soak.add_argument("--tracemalloc", action="store_true", help="koşu sonu Python yığını (yavaşlatır)")
+
+    p_record = sub.add_parser("record", help="canlı feed + makaleleri replay fixture'ı olarak kaydet")
+    p_record.add_argument("dir")
+
+    p_startup = sub.add_parser("startup", help="'import main' süresi (temiz süreçlerde)")
+    p_startup.add_argument("-n", type=int, default=5, help="süreç sayısı")
+    args = ap.parse_args()
+
+    if args.cmd == "text":
+        bench_text(args.n)
+    elif args.cmd == "replay":
+        bench_replay(args)
+    elif args.cmd == "soak":
+        sys.exit(bench_soak(args))
+    elif args.cmd == "record":
+        record_fixtures(args.dir)
+    elif args.cmd == "startup":
+        bench_startup(args.n)
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,36 +1,66 @@
 # -*- coding: utf-8 -*-
 """
 Platcorn NewsBot – tek dosya (anti-duplicate hardened)
+- Feed'ler paralel indirilir (global + host başına eşzamanlılık sınırı, timeout);
+  her feed yayın sıklığına göre yoklanır (hata verene üstel geri çekilme).
+- Koşullu GET (ETag / Last-Modified + içerik özeti, sqlite 'feed_cache'):
+  değişmeyen feed parse edilmez. Değişen feed akışla ayrıştırılır (XMLPullParser,
+  küçük FeedEntry kayıtları); ilk girişler / tazelik kapısından eski ilk giriş okununca
+  durulur, biçim tanınmazsa feedparser'a düşülür.
 - Sadece anahtar kelime eşleşen haberleri yollar (başlık + opsiyonel gövde araması).
+- Öncelik sırası: ucuz aşamaları geçen haberler keyword ağırlığı (CORE > GLOBAL),
+  yayıncı, tazelik ve yayıncılar arası teyide göre puanlanır; makale çekme ve gönderim
+  puan sırasıyla, koşu bütçesi (CYCLE_SEND_BUDGET) makale çekilmeden uygulanır.
 - Eski haberleri atlar (MAX_AGE_HOURS).
 - Tekrar göndermez: canonical URL + normalize_link + sqlite 'seen' + 'seen_link'
-  + koşu içi set'ler + 72 saatlik başlık-parmakizi (recent_title).
-- Başlık/özet Türkçeleştirme (GoogleTranslator) + özet (sumy LSA).
-- HTML güvenliği (escape) + Telegram HTML parse_mode.
-- healthchecks.io pingi Python’dan atar (/start, /fail, başarı).
+  + koşu içi set'ler + 72 saatlik başlık-parmakizi (recent_title)
+  + yayıncılar arası yakın-kopya başlık indeksi (MinHash LSH, near_dup).
+  GitHub Actions'ta link/başlık dedupe'u koşular arası ~/.newsbot/state.snap ile taşınır.
+- Başlık/özet Türkçeleştirme (GoogleTranslator, koşu başına toplu istek + sqlite
+  'translation_cache' LRU/TTL önbellek) + özet (sumy LSA). Paketler sınırlı iş parçacığı
+  havuzuyla paralel gider; Türkçe kaynaklı haber çevrilmez; arka uç değiştirilebilir
+  (TRANSLATE_BACKEND, ağsız "offline" taklit test/ölçüm için).
+- HTML güvenliği (escape) + Telegram HTML parse_mode; gönderim kuyruğu (tek Session,
+  429 retry_after, geri çekilmeli tekrar), işaretleme teslim onayından sonra.
+- Çoklu kanal (ROUTES): kategori/keyword'e göre birden çok chat_id; haber bir kez çekilip
+  çevrilir, her hedefe dağıtılır, dedupe hedef başına ('delivered').
+- Opsiyonel özet modu (DIGEST_MODE): koşunun haberleri yayıncı/keyword grubuna göre
+  4096 karakterlik en az sayıda mesajda gönderilir.
+- seen.db: saklama süresi + periyodik sıkıştırma (silme + incremental vacuum).
+- healthchecks.io pingi Python’dan atar (/start, /fail, başarı); ping gövdesinde koşu özeti.
+- Ölçümler: aşama süreleri (histogram) + sayaçlar (giren/çıkan haber, eleme türü,
+  feed hataları, önbellek isabetleri) -> ~/.newsbot/metrics.prom (Prometheus metin
+  formatı) ve last_cycle.json (koşu özeti).
+
+- Hızlı açılış: çeviri/özet/makale kütüphaneleri ilk ihtiyaçta yüklenir; NLTK punkt
+  verisi import'ta değil, kurulum adımında indirilir (python main.py --setup; daemon ve
+  yerel çalıştırma açılışta bir kez kendisi kontrol eder).
 
 Gereken paketler: feedparser requests deep-translator sumy newspaper3k nltk
 """
 
-import os, re, time, sqlite3, html
-from datetime import datetime
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+import time
+_T_START = time.perf_counter()   # açılış süresi ölçümü (import'lar dahil)
+
+import os, re, sys, socket, sqlite3, html, threading, hashlib, queue, random, struct, zlib, json, calendar
+import multiprocessing
+import xml.etree.ElementTree as ET
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode, urljoin
 
 import feedparser, requests
-from deep_translator import GoogleTranslator
 
-# Özetleme & NLTK
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-import nltk
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt")
+# Ağır bağımlılıklar (deep_translator, sumy/nltk, lxml, newspaper) kullanıldıkları
+# fonksiyonlarda yüklenir: hiçbir haberin kapılardan geçmediği koşu bunları hiç açmaz.
+GoogleTranslator = None   # deep_translator.GoogleTranslator — translator_class() doldurur
 
-# Makale gövdesi
-from newspaper import Article
+NLTK_DATA = ("punkt", "punkt_tab")   # sumy Tokenizer("english") için (--setup indirir)
 
 # =======================
 # KULLANICI AYARLARI
@@ -39,22 +69,143 @@ from newspaper import Article
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
 TELEGRAM_CHAT_ID   = os.getenv("TELEGRAM_CHAT_ID", "").strip()
 
-INTERVAL_SECONDS     = 300         # 5 dk
+INTERVAL_SECONDS     = 300         # 5 dk (yeni feed'in ilk yoklama aralığı; 0 = tek koşu)
 MAX_ITEMS_PER_FEED   = 6
 SUMMARY_SENTENCES    = 4
 TRANSLATE_TITLES     = True
 TRANSLATE_SUMMARIES  = True
 
 STRICT_KEYWORDS   = True       # sadece filtreye uyanlar
-SEARCH_IN_SUMMARY = False      # gövde araması (gürültü için kapalı)
+SEARCH_IN_SUMMARY = False      # gövde araması (gürültü için kapalı; eşleştirici tek geçiş, açmak ucuz)
 MAX_AGE_HOURS     = 24
 
 # --- tekrar/yenilik kontrolleri ---
-FRESH_ONLY_MINUTES   = 15   # SADECE son 15 dk’da yayınlananlar
+FRESH_ONLY_MINUTES   = 15   # en az son 15 dk’da yayınlananlar (feed'in son başarılı yoklamasından beri)
+FRESH_GRACE_SECONDS  = 120  # son yoklamadan bu kadar öncesi de kabul (geç görünen girişler)
+FRESH_MAX_LOOKBACK_HOURS = 3  # uzun kesintiden sonra bile en fazla bu kadar geriye bakılır
 RECENT_TITLE_TTL_HRS = 72   # Aynı başlık-parmakizi 72 saat içinde tekrar gönderilmez
 
+# --- yayıncılar arası yakın-kopya (MinHash LSH, başlık kelimeleri) ---
+NEAR_DUP_MIN_SIMILARITY = 0.7    # tahmini Jaccard bu değer ve üstüyse aynı haber sayılır; 0 = kapalı
+NEAR_DUP_BANDS          = 16     # LSH bant sayısı (bant başına NEAR_DUP_ROWS imza değeri)
+NEAR_DUP_ROWS           = 2
+NEAR_DUP_USE_LEAD       = False  # başlığa ek olarak ilk paragraf (makale çekildikten sonra)
+NEAR_DUP_TTL_HRS        = RECENT_TITLE_TTL_HRS
+
+# --- öncelik sırası / koşu bütçesi ---
+# Kısa listeye kalan haberler (ucuz aşamalardan sonra, makale çekilmeden) puanlanır ve
+# makale çekme + gönderim puan sırasıyla yapılır.
+# puan = CORE keyword ağırlıkları + GLOBAL/kategori ağırlıkları (en çok SCORE_GLOBAL_CAP)
+#        + yayıncı ağırlığı + tazelik (yarı ömürlü) + başka yayıncılardaki yakın-kopya (teyit)
+CYCLE_SEND_BUDGET          = 0      # koşu başına en fazla aday (puan sırasıyla); 0 = sınırsız
+SCORE_CORE_WEIGHT          = 3.0    # CORE keyword başına (yayıncı/creator isimleri)
+SCORE_GLOBAL_WEIGHT        = 1.0    # GLOBAL / kategori keyword başına
+SCORE_GLOBAL_CAP           = 3.0    # GLOBAL kelimelerle doldurulmuş başlık CORE isimleri geçmesin
+KEYWORD_WEIGHTS = {                  # CORE/GLOBAL varsayılanını ezen ağırlıklar
+    "youtube": 1.5, "twitch": 1.5, "kick": 1.5, "tiktok": 1.5, "instagram": 1.5,
+    "x": 0.5, "threads": 1.0, "rumble": 1.5, "livestream": 1.0, "streamer": 1.0, "stream": 1.0,
+}
+PUBLISHER_WEIGHTS = {                # yayıncı (PUBLISHER_MAP adı ya da host) -> ek puan
+    "Dexerto": 1.0,
+    "www.tubefilter.com": 1.0,
+    "Reddit / LivestreamFail": -0.5,
+}
+SCORE_FRESH_WEIGHT           = 2.0   # yeni yayınlanmış haberin tazelik puanı
+SCORE_FRESH_HALF_LIFE_MINUTES = 30   # tazelik puanı bu sürede yarıya iner
+SCORE_CORROBORATION_WEIGHT   = 1.5   # aynı haberi veren başka yayıncı başına
+SCORE_CORROBORATION_MAX      = 3
+
+# --- saklama / sıkıştırma (seen.db) ---
+# Gün cinsinden; MAX_AGE_HOURS'tan eski haber zaten elendiği için birkaç gün yeterli.
+DB_TABLES = ("seen", "seen_link", "recent_title", "feed_cache", "translation_cache",
+             "near_dup", "near_dup_band", "article_cache", "feed_schedule", "delivered")
+RETENTION_DAYS = {
+    "seen":         14,
+    "seen_link":    14,
+    "recent_title": RECENT_TITLE_TTL_HRS / 24,
+    "feed_cache":   30,   # listeden çıkarılmış feed'lerin doğrulayıcıları
+    "near_dup":      NEAR_DUP_TTL_HRS / 24,
+    "near_dup_band": NEAR_DUP_TTL_HRS / 24,
+    "article_cache": 7,
+    "feed_schedule": 30,   # listeden çıkarılmış feed'ler
+    "delivered":    14,
+}
+COMPACT_INTERVAL_HOURS = 6   # koşular arasında en fazla bu sıklıkla silme + incremental vacuum
+
+# --- çeviri önbelleği / toplu çeviri ---
+TRANSLATION_CACHE_TTL_DAYS = 30      # önbellekteki çeviri en fazla bu kadar yaşar
+TRANSLATION_CACHE_MAX_ROWS = 20000   # aşılırsa en uzun süre kullanılmayanlar silinir (LRU)
+TRANSLATE_BATCH_CHARS      = 4500    # tek istekte gönderilen en fazla karakter (Google sınırı 5000)
+TRANSLATE_BACKEND          = "google"   # "google" | "offline" (ağ yok, metni aynen döner; test/ölçüm)
+TRANSLATE_WORKERS          = 4       # aynı anda giden en fazla çeviri isteği (paketler paralel)
+TRANSLATE_SKIP_TURKISH     = True    # Türkçe kaynaklı haber (onedio, webtekno ...) çeviriye gönderilmez
+
+# --- uyarlanabilir feed yoklama ---
+POLL_MIN_SECONDS   = 120          # çok yayın yapan feed en sık bu aralıkla
+POLL_MAX_SECONDS   = 3600         # sessiz feed en seyrek bu aralıkla
+POLL_GAP_FACTOR    = 0.5          # aralık = gözlenen ortalama yayın aralığı × bu katsayı
+POLL_BACKOFF_MAX_SECONDS = 6 * 3600   # hata veren feed için üstel geri çekilme tavanı
+POLL_TICK_SECONDS        = POLL_MIN_SECONDS   # next_poll bu aralığın katına yuvarlanır (feed'ler aynı koşuyu paylaşır)
+POLL_GROUP_SLACK_SECONDS = POLL_MIN_SECONDS   # bir feed'in zamanı gelince bu kadar içinde gelecekler de yoklanır
+
+# --- özetleme ---
+SUMMARY_WORKERS   = max(1, (os.cpu_count() or 2) - 1)   # LSA süreç havuzu; 0 = ana süreçte
+SUMMARY_MAX_CHARS = 20000   # LSA'ya giden metin üst sınırı (uzun Variety/THR yazıları), 0 = sınırsız
+
+# --- Telegram gönderimi ---
+TG_MAX_ATTEMPTS    = 5      # geçici hata / 429 için en fazla deneme
+TG_BACKOFF_SECONDS = 1.0    # geçici hatalarda 1, 2, 4 ... sn bekleme
+TG_TIMEOUT_SECONDS = 30
+TELEGRAM_API_BASE  = "https://api.telegram.org"   # bench.py yerel taklit sunucuya yönlendirir
+TG_MAX_MESSAGE_CHARS = 4096   # Telegram mesaj sınırı
+# Gönderim sonucu: teslim edildi / geçici hata (sonraki koşuda tekrar) / kalıcı ret (400/403)
+TG_SENT, TG_RETRY, TG_REJECTED = "sent", "retry", "rejected"
+SEND_CHUNK_ITEMS   = 8      # bu kadar haberin çevirisi bitince gönderim kuyruğuna (çeviri/gönderim örtüşür)
+
+# --- çoklu kanal yönlendirme ---
+# Her kural: hedef chat_id'ler + hangi kategoriler ve/veya başlık keyword'leri o hedefe gider.
+# Kategori/keyword verilmeyen kural her haberi alır; chat_id'si boş kural (ENV yok) kapalıdır.
+# Liste boşsa tek kanal: her şey TELEGRAM_CHAT_ID'ye (eski davranış). Makale çekme, özet ve
+# çeviri haber başına bir kez yapılır; dedupe hedef başına (seen.db 'delivered') izlenir.
+ROUTES = [
+    # {"chat_ids": [os.getenv("TELEGRAM_CHAT_ID_CREATOR", "")], "categories": ["🟢 Platcorn & Creator"]},
+    # {"chat_ids": [os.getenv("TELEGRAM_CHAT_ID_KICK", "")], "keywords": ["kick", "adin ross"]},
+]
+
+# --- özet (digest) modu: haber başına mesaj yerine gruplu birkaç mesaj ---
+DIGEST_MODE           = False        # False = her haber ayrı mesaj (varsayılan)
+DIGEST_GROUP_BY       = "publisher"  # "publisher" | "keyword" (başlıktaki ilk CORE kelime) | "category"
+DIGEST_WINDOW_SECONDS = 0            # 0 = koşu sonunda gönder; >0 = sürekli modda bu süre biriktir
+DIGEST_ITEM_CHARS     = 350          # özet mesajında haber başına Türkçe özet üst sınırı
+
+# --- makale çekme ---
+ARTICLE_MAX_BYTES       = 1_500_000   # HTML'in en fazla bu kadarı indirilir
+ARTICLE_TIMEOUT_SECONDS = 15
+ARTICLE_MIN_TEXT_CHARS  = 300         # yalın çıkarıcı daha kısa metin bulursa newspaper'a düşülür
+ARTICLE_ENOUGH_TEXT_CHARS = 30_000    # <head> okunduktan sonra bu kadar paragraf metni gelince indirme durur
+ARTICLE_CACHE_FRESH_HOURS = 6         # bu süre içinde aynı URL ağa çıkmadan önbellekten
+ARTICLE_CACHE_MAX_BYTES   = 50_000_000  # sıkıştırılmış toplam; aşılınca en eski kullanılanlar silinir (LRU)
+
+# --- feed indirme ---
+FEED_FETCH_WORKERS   = 8    # aynı anda indirilen en fazla feed
+FEED_PER_HOST_LIMIT  = 2    # aynı host'a eşzamanlı istek sınırı (dexerto'da 4 feed var)
+FEED_TIMEOUT_SECONDS = 15   # feed başına bağlantı/okuma zaman aşımı (her okuma için ayrı)
+FEED_DEADLINE_SECONDS = 30  # feed başına toplam süre: yavaş damlayan sunucu host slotunu tutamaz
+FEED_MAX_BYTES       = 2_000_000   # feed gövdesinin en fazla bu kadarı indirilir (baştaki girişler yeter)
+FEED_SCAN_ENTRIES    = 10   # feed başına okunan en fazla giriş (yoklama planı örneği; işlenen MAX_ITEMS_PER_FEED)
+FEED_GAP_SAMPLE      = 5    # tazelik kapısında erken durmadan önce en az bu kadar giriş zamanı (yayın aralığı tahmini)
+USER_AGENT = "Mozilla/5.0 (compatible; PlatcornNewsBot/1.0; +https://t.me/platcorn)"
+
 APP_DIR = os.path.join(os.path.expanduser("~"), ".newsbot")
 DB_PATH = os.path.join(APP_DIR, "seen.db")
+# GitHub Actions'ta seen.db her koşuda sıfırdır: seen_link + recent_title özeti bu dosyada
+# taşınır (actions/cache). Boyutu saklama süreleriyle sınırlı; "" = kapalı.
+STATE_SNAPSHOT_PATH = os.path.join(APP_DIR, "state.snap")
+
+# --- ölçümler ---
+METRICS_PROM_PATH = os.path.join(APP_DIR, "metrics.prom")      # Prometheus metin formatı ("" = yazma)
+METRICS_JSON_PATH = os.path.join(APP_DIR, "last_cycle.json")   # son koşunun özeti ("" = yazma)
+METRICS_BUCKETS   = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
 
 # =======================
 # ANAHTAR KELİMELER
@@ -174,9 +325,137 @@ def log(msg: str):
 def ensure_app_dir():
     os.makedirs(APP_DIR, exist_ok=True)
 
+def write_file_atomic(path: str, data):
+    """Okuyucu (node_exporter textfile vb.) yarım dosya görmesin: tmp + os.replace."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+# ----- Ölçümler (sayaç + süre histogramı) -----
+
+class Metrics:
+    """
+    Süreç içi sayaçlar ve süre histogramları (iş parçacıkları arası güvenli).
+    Toplamlar süreç boyunca birikir (Prometheus counter/histogram); koşu özeti
+    için aynı değerler begin_cycle() ile sıfırlanan ayrı bir sayaçta da tutulur.
+    """
+
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.counters = {}            # (ad, etiketler) -> toplam
+        self.gauges = {}              # (ad, etiketler) -> son değer
+        self.hists = {}               # (ad, etiketler) -> [kova sayıları..., toplam sn, adet]
+        self.cycle_counts = Counter() # koşu içi sayaçlar
+        self.cycle_secs = Counter()   # koşu içi toplam süreler
+
+    @staticmethod
+    def _key(name: str, labels: dict):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value=1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+            self.cycle_counts[key] += value
+
+    def set(self, name: str, value, **labels):
+        with self.lock:
+            self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            h = self.hists.get(key)
+            if h is None:
+                h = self.hists[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    h[i] += 1
+            h[-2] += seconds
+            h[-1] += 1
+            self.cycle_secs[key] += seconds
+
+    @contextmanager
+    def timed(self, name: str, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    def begin_cycle(self):
+        with self.lock:
+            self.cycle_counts.clear()
+            self.cycle_secs.clear()
+
+    @staticmethod
+    def _render(key, extra=()) -> str:
+        name, labels = key
+        labels = labels + tuple(extra)
+        if not labels:
+            return name
+        esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return name + "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels) + "}"
+
+    def cycle_summary(self) -> dict:
+        """Koşu içi sayaçlar ve süreler: {"counters": {ad{etiket}: n}, "seconds": {...}}"""
+        with self.lock:
+            return {
+                "counters": {self._render(k): v for k, v in sorted(self.cycle_counts.items()) if v},
+                "seconds":  {self._render(k): round(v, 3) for k, v in sorted(self.cycle_secs.items())},
+            }
+
+    def prometheus_text(self) -> str:
+        lines, typed = [], set()
+        def type_line(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+        with self.lock:
+            for key, v in sorted(self.counters.items()):
+                type_line(key[0], "counter")
+                lines.append(f"{self._render(key)} {v}")
+            for key, v in sorted(self.gauges.items()):
+                type_line(key[0], "gauge")
+                lines.append(f"{self._render(key)} {v}")
+            for key, h in sorted(self.hists.items()):
+                name, labels = key
+                type_line(name, "histogram")
+                for bound, n in zip(self.buckets, h):
+                    lines.append(f"{self._render((name + '_bucket', labels), [('le', str(bound))])} {n}")
+                lines.append(f"{self._render((name + '_bucket', labels), [('le', '+Inf')])} {h[-1]}")
+                lines.append(f"{self._render((name + '_sum', labels))} {h[-2]:.6f}")
+                lines.append(f"{self._render((name + '_count', labels))} {h[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, summary: dict):
+        """Prometheus dosyasını ve koşu özetini (JSON) yazar; hata koşuyu bozmaz."""
+        try:
+            if METRICS_PROM_PATH:
+                write_file_atomic(METRICS_PROM_PATH, self.prometheus_text())
+            if METRICS_JSON_PATH:
+                write_file_atomic(METRICS_JSON_PATH, json.dumps(summary, ensure_ascii=False, indent=1))
+        except OSError as e:
+            log(f"Ölçüm dosyası yazılamadı: {e}")
+
+METRICS = Metrics()
+
 def init_db():
     ensure_app_dir()
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    # yeni veritabanında boş sayfalar incremental_vacuum ile dosyadan geri verilebilsin
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    # WAL: okuyucular yazarı beklemez; NORMAL: commit başına fsync yok (WAL checkpoint'te)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")   # başka süreç yazıyorsa bekle
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-8000")     # ~8 MB sayfa önbelleği
     conn.execute("""
         CREATE TABLE IF NOT EXISTS seen (
             id TEXT PRIMARY KEY,
@@ -200,9 +479,162 @@ def init_db():
             ts  INTEGER
         )
     """)
+    # koşullu GET önbelleği (ETag / Last-Modified / içerik özeti)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS feed_cache (
+            url           TEXT PRIMARY KEY,
+            etag          TEXT,
+            last_modified TEXT,
+            content_hash  TEXT,
+            ts            INTEGER
+        )
+    """)
+    # çeviri önbelleği: h = sha1(kaynak:hedef:yer tutuculu metin)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS translation_cache (
+            h     TEXT PRIMARY KEY,
+            tr    TEXT,
+            ts    INTEGER,  -- oluşturma (TTL)
+            used  INTEGER   -- son kullanım (LRU)
+        )
+    """)
+    # yakın-kopya indeksi: MinHash imzası + LSH bant anahtarları
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS near_dup (
+            id   INTEGER PRIMARY KEY,
+            sig  BLOB,
+            ts   INTEGER
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS near_dup_band (
+            key  INTEGER,   -- hash(bant no + bant değerleri)
+            nid  INTEGER,   -- near_dup.id
+            ts   INTEGER
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_near_dup_band_key ON near_dup_band (key)")
+    # makale gövdesi önbelleği (normalize_link anahtarlı, zlib sıkıştırılmış metin)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_cache (
+            url    TEXT PRIMARY KEY,
+            body   BLOB,      -- zlib(metin)
+            canon  TEXT,
+            etag   TEXT,
+            size   INTEGER,   -- len(body)
+            ts     INTEGER,   -- çekilme / son doğrulama
+            used   INTEGER    -- son kullanım (LRU)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_article_cache_used ON article_cache (used)")
+    # feed başına yoklama planı (gözlenen yayın aralığı, hata sayısı, son başarılı yoklama)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS feed_schedule (
+            url        TEXT PRIMARY KEY,
+            next_poll  INTEGER,
+            interval   INTEGER,
+            last_ok    INTEGER,   -- son başarılı yoklamanın başlangıcı
+            gap        REAL,      -- girişler arası ortalama süre (sn, EWMA)
+            errors     INTEGER,   -- art arda hata sayısı
+            ts         INTEGER
+        )
+    """)
+    # hedef (chat_id) başına teslim kaydı: kısmen teslim edilen haber sadece eksik hedeflere gider
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS delivered (
+            chat_id TEXT,
+            link    TEXT,
+            ts      INTEGER,
+            PRIMARY KEY (chat_id, link)
+        )
+    """)
+    # küçük anahtar/değer durumu (ör. son sıkıştırma; tek koşuluk çalıştırmalar arasında kalır)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key    TEXT PRIMARY KEY,
+            value  TEXT
+        )
+    """)
+    # saklama süresi silmeleri ts üzerinden
+    for table in DB_TABLES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_ts ON {table} (ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_translation_cache_used ON translation_cache (used)")
     conn.commit()
+    # eski (auto_vacuum=NONE) veritabanı: bir kerelik VACUUM ile INCREMENTAL'e geç
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("VACUUM")
     return conn
 
+_db_conn = None
+
+def get_db():
+    """Süreç boyunca tek (uzun ömürlü) sqlite bağlantısı."""
+    global _db_conn
+    if _db_conn is None:
+        _db_conn = init_db()
+    return _db_conn
+
+def close_db():
+    global _db_conn
+    if _db_conn is not None:
+        _db_conn.close()
+        _db_conn = None
+
+# --- Saklama / sıkıştırma ---
+
+def db_stats(conn) -> dict:
+    """Tablo satır sayıları + dosya boyutu (bayt) + boş sayfa baytı."""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    stats = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in DB_TABLES}
+    stats["bytes"] = conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+    stats["free_bytes"] = conn.execute("PRAGMA freelist_count").fetchone()[0] * page_size
+    return stats
+
+def compact_db(conn) -> dict:
+    """
+    Saklama süresini (RETENTION_DAYS) geçen satırları siler, çeviri önbelleğini
+    budar, boş sayfaları incremental_vacuum ile dosyadan geri verir ve WAL'ı kırpar.
+    """
+    before = db_stats(conn)
+    now = int(time.time())
+    deleted = 0
+    with conn:
+        for table, days in RETENTION_DAYS.items():
+            cur = conn.execute(f"DELETE FROM {table} WHERE ts < ?", (now - int(days * 86400),))
+            deleted += cur.rowcount
+    prune_translation_cache(conn)
+    prune_article_cache(conn)
+    # execute() pragmayı tek adım çalıştırır (tek sayfa); executescript sonuna kadar yürütür
+    conn.executescript("PRAGMA incremental_vacuum;")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    after = db_stats(conn)
+    tables = " ".join(f"{t}={after[t]}" for t in DB_TABLES)
+    log(f"DB sıkıştırma: {tables} | silinen: {deleted} | "
+        f"boyut {before['bytes'] // 1024} KB -> {after['bytes'] // 1024} KB "
+        f"(geri kazanılan {(before['bytes'] - after['bytes']) // 1024} KB)")
+    after["deleted"] = deleted
+    after["reclaimed_bytes"] = before["bytes"] - after["bytes"]
+    return after
+
+def maybe_compact_db():
+    """
+    Koşular arasında çağrılır; COMPACT_INTERVAL_HOURS dolduysa sıkıştırır. Son sıkıştırma
+    zamanı DB'de (meta) tutulur: tek koşuluk çalıştırmalar her seferinde sıkıştırmaz.
+    Yeni veritabanında süre ilk çağrıdan başlar.
+    """
+    try:
+        conn = get_db()
+        now = int(time.time())
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_compact'").fetchone()
+        due = row is not None and now - int(row[0]) >= COMPACT_INTERVAL_HOURS * 3600
+        if row is None or due:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_compact', ?)", (str(now),))
+        if due:
+            compact_db(conn)
+    except Exception as e:
+        log(f"DB sıkıştırma hatası: {e}")
+
 def escape_html(s: str) -> str:
     return html.escape(s or "", quote=False)
 
@@ -228,60 +660,389 @@ def normalize_link(url: str) -> str:
         return url
 
 def entry_unix_ts(e):
+    """feedparser girişinin zamanı; *_parsed alanları UTC struct_time'dır (mktime değil timegm)."""
     for attr in ("published_parsed", "updated_parsed"):
         t = getattr(e, attr, None)
         if t:
             try:
-                return int(time.mktime(t))
+                return int(calendar.timegm(t))
             except Exception:
                 pass
     return None
 
 def is_too_old(e) -> bool:
-    ts = entry_unix_ts(e)
+    ts = e.ts
     if not ts:
         return True
     return (time.time() - ts) > MAX_AGE_HOURS * 3600
 
-def is_new_enough(e) -> bool:
-    """Sadece son FRESH_ONLY_MINUTES dakikada yayınlananları kabul et."""
-    ts = entry_unix_ts(e)
+def is_new_enough(e, since=None) -> bool:
+    """since (unix ts) sonrası ya da verilmezse son FRESH_ONLY_MINUTES dakikada yayınlananlar."""
+    ts = e.ts
     if not ts:
         return False
+    if since is not None:
+        return ts >= since
     return (time.time() - ts) <= FRESH_ONLY_MINUTES * 60
 
+# --- Uyarlanabilir yoklama planı ---
+# Her feed'in girişleri arasındaki ortalama süre izlenir; sık yayın yapan feed sık,
+# sessiz feed seyrek yoklanır. Art arda hata veren feed üstel olarak geri çekilir.
+
+def load_feed_schedule(conn) -> dict:
+    rows = conn.execute("SELECT url, next_poll, interval, last_ok, gap, errors FROM feed_schedule")
+    return {
+        url: {"next_poll": nxt, "interval": itv, "last_ok": last_ok, "gap": gap, "errors": errors or 0}
+        for url, nxt, itv, last_ok, gap, errors in rows
+    }
+
+def save_feed_schedule(conn, url: str, st: dict):
+    conn.execute(
+        "INSERT OR REPLACE INTO feed_schedule (url, next_poll, interval, last_ok, gap, errors, ts) "
+        "VALUES (?,?,?,?,?,?, strftime('%s','now'))",
+        (url, st["next_poll"], st["interval"], st["last_ok"], st["gap"], st["errors"])
+    )
+
+def due_feeds(schedule: dict, feed_urls, now=None, slack=0):
+    """
+    Zamanı gelen feed'ler. En az biri geldiyse slack saniye içinde gelecek olanlar da
+    katılır: yoklamalar tek koşuda toplanır (sıralama/bütçe tüm feed'ler üzerinden).
+    """
+    now = now or time.time()
+    nxt = {u: schedule[u]["next_poll"] if u in schedule else now for u in feed_urls}
+    if not any(t <= now for t in nxt.values()):
+        return []
+    return [u for u, t in nxt.items() if t <= now + slack]
+
+def seconds_until_due(schedule: dict, feed_urls, now=None) -> float:
+    now = now or time.time()
+    nxt = [schedule[u]["next_poll"] if u in schedule else now for u in feed_urls]
+    return max(0.0, min(nxt, default=now + INTERVAL_SECONDS) - now)
+
+def feed_fresh_since(st, now=None) -> int:
+    """Tazelik kapısı: son başarılı yoklama - pay; en az FRESH_ONLY_MINUTES, en çok FRESH_MAX_LOOKBACK_HOURS."""
+    now = now or time.time()
+    since = now - FRESH_ONLY_MINUTES * 60
+    if st and st.get("last_ok"):
+        since = min(since, st["last_ok"] - FRESH_GRACE_SECONDS)
+    return int(max(since, now - FRESH_MAX_LOOKBACK_HOURS * 3600))
+
+def poll_tick(t: float) -> int:
+    """Zamanı POLL_TICK_SECONDS katına yukarı yuvarlar: yakın planlar aynı koşuda toplanır."""
+    tick = max(1, int(POLL_TICK_SECONDS))
+    return -(-int(t) // tick) * tick
+
+def schedule_after_poll(st, started: float, outcome: str, entry_ts=()):
+    """
+    Yoklama sonucuna göre yeni plan. outcome: "ok" (yeni gövde), "unchanged"
+    (304 / aynı gövde) veya "error". entry_ts: feed'deki girişlerin zamanları.
+    """
+    st = dict(st or {"interval": INTERVAL_SECONDS, "last_ok": None, "gap": None, "errors": 0})
+    if outcome == "error":
+        st["errors"] += 1
+        backoff = min(POLL_BACKOFF_MAX_SECONDS, st["interval"] * 2 ** st["errors"])
+        st["next_poll"] = poll_tick(started + backoff)
+        return st
+    st["errors"] = 0
+    st["last_ok"] = int(started)
+    if outcome == "ok":
+        ts = sorted((t for t in entry_ts if t), reverse=True)[:10]
+        if ts:
+            # uzun süredir yeni giriş yoksa eski bir patlamanın kısa aralığı belirleyici olmasın
+            observed = max((ts[0] - ts[-1]) / (len(ts) - 1) if len(ts) > 1 else 0, started - ts[0])
+            st["gap"] = observed if st["gap"] is None else 0.5 * st["gap"] + 0.5 * observed
+        if st["gap"] is not None:
+            st["interval"] = st["gap"] * POLL_GAP_FACTOR
+    else:
+        st["interval"] = st["interval"] * 1.25   # değişmedi: biraz seyrekleş
+    st["interval"] = int(min(POLL_MAX_SECONDS, max(POLL_MIN_SECONDS, st["interval"])))
+    st["next_poll"] = poll_tick(started + st["interval"])
+    return st
+
 # --- Makale çek: (text, canonical_link) ---
-def fetch_article(url: str):
+# Yalın yol: HTML akışla ve ARTICLE_MAX_BYTES sınırıyla indirilirken lxml'e verilir;
+# <head> bittiğinde (kanonik/og:url okundu) ve ya metni yeten bir <article> kapandığında
+# ya da ARTICLE_ENOUGH_TEXT_CHARS paragraf metni geldiğinde indirme durur. Ana metin en
+# çok paragraf metni taşıyan bloktur. newspaper'ın görsel puanlama/yazar/tarih işleri
+# yapılmaz; yalın çıkarıcı yetmezse newspaper'a aynı (indirilmiş) HTML verilir.
+
+_ARTICLE_NOISE = ("script", "style", "noscript", "nav", "header", "footer", "aside",
+                  "form", "iframe", "svg", "figure", "button")
+
+def download_html(url: str, etag=None, until=None):
+    """
+    Dönüş: (html byte'ları, son URL, karakter kodlaması | None, ETag | None).
+    etag verilmiş ve sunucu 304 dönerse byte'lar None'dır. until(parça, kodlama) True
+    dönerse okuma durur, gövdenin kalanı indirilmez.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    with http_session().get(url, headers=headers, timeout=ARTICLE_TIMEOUT_SECONDS, stream=True) as r:
+        if r.status_code == 304:
+            return None, r.url or url, None, etag
+        r.raise_for_status()
+        encoding = r.encoding if "charset" in r.headers.get("Content-Type", "").lower() else None
+        buf = bytearray()
+        for chunk in r.iter_content(chunk_size=65536):
+            chunk = chunk[:ARTICLE_MAX_BYTES - len(buf)]
+            buf += chunk
+            if len(buf) >= ARTICLE_MAX_BYTES or (until is not None and until(chunk, encoding)):
+                break
+        return bytes(buf), r.url or url, encoding, r.headers.get("ETag") or None
+
+class HtmlStream:
+    """
+    download_html(until=...) için: gelen HTML'i parça parça ayrıştırır, <head> ve yeterli
+    makale metni gelince True döner. Ağaç close() ile alınır (kesilmiş gövde de geçerli).
+    """
+
+    def __init__(self):
+        self.parser = None
+        self.head_done = False
+        self.text_chars = 0
+
+    def __call__(self, chunk: bytes, encoding) -> bool:
+        from lxml import etree
+        import lxml.html
+        if self.parser is None:
+            kw = {"encoding": encoding} if encoding else {}
+            self.parser = etree.HTMLPullParser(events=("start", "end"), **kw)
+            self.parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        self.parser.feed(chunk)
+        done = False
+        for event, el in self.parser.read_events():
+            if event == "start":
+                self.head_done = self.head_done or el.tag == "body"
+            elif el.tag == "head":
+                self.head_done = True
+            elif el.tag == "p":
+                self.text_chars += len(el.text_content().strip())
+            elif el.tag == "article" and self.head_done:
+                done = done or sum(len(p.text_content().strip()) for p in el.iter("p")) >= ARTICLE_MIN_TEXT_CHARS
+        return done or (self.head_done and self.text_chars >= ARTICLE_ENOUGH_TEXT_CHARS)
+
+    def close(self):
+        """Ayrıştırılan belge (kök) | None."""
+        if self.parser is None:
+            return None
+        try:
+            return self.parser.close()
+        except Exception:   # lxml: boş / hiç öğe içermeyen belge
+            return None
+
+def extract_canonical(doc, base_url: str) -> str:
+    for xp in ('//link[translate(@rel,"CANONICAL","canonical")="canonical"]/@href',
+               '//meta[@property="og:url"]/@content'):
+        hits = doc.xpath(xp)
+        if hits and hits[0].strip():
+            return urljoin(base_url, hits[0].strip())
+    return ""
+
+def extract_main_text(doc) -> str:
+    """Readability benzeri: paragraf metni ebeveyne tam, büyük ebeveyne yarım puan yazar."""
+    from lxml import etree
+    etree.strip_elements(doc, *_ARTICLE_NOISE, with_tail=False)
+    scores = {}
+    for p in doc.iter("p"):
+        n = len(p.text_content().strip())
+        if n < 30:
+            continue
+        parent = p.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0) + n
+        grand = parent.getparent()
+        if grand is not None:
+            scores[grand] = scores.get(grand, 0) + n / 2
+    if not scores:
+        return ""
+    best = max(scores, key=scores.get)
+    paras = (re.sub(r"\s+", " ", p.text_content()).strip() for p in best.iter("p"))
+    return "\n\n".join(t for t in paras if len(t) >= 30)
+
+def fetch_article_lean(url: str, etag=None):
+    """Dönüş: (metin, kanonik, ETag, indirilen HTML); 304 ise metin ve HTML None."""
+    stream = HtmlStream()
+    data, final_url, encoding, etag = download_html(url, etag, until=stream)
+    if data is None:
+        return None, "", etag, None
+    doc = stream.close()
+    if doc is None:
+        return "", "", etag, data
+    canon = extract_canonical(doc, final_url)
+    return extract_main_text(doc), canon, etag, data
+
+def fetch_article_newspaper(url: str, html=None):
+    """html verilirse (yalın yolun indirdiği) tekrar indirilmez."""
     try:
+        from newspaper import Article
         art = Article(url)
-        art.download(); art.parse()
+        if html:
+            art.download(input_html=html)
+        else:
+            art.download()
+        art.parse()
         txt   = (art.text or "").strip()
         canon = (art.canonical_link or "").strip()
         return txt, canon
     except Exception:
         return "", ""
 
+def fetch_article_meta(url: str, etag=None):
+    """
+    Dönüş: (metin, kanonik, ETag). etag ile koşullu istek yapılır; 304 gelirse
+    metin None döner (önbellekteki hâlâ geçerli).
+    """
+    canon, new_etag, html_bytes = "", None, None
+    try:
+        with METRICS.timed("newsbot_call_seconds", call="article_lean"):
+            txt, canon, new_etag, html_bytes = fetch_article_lean(url, etag)
+        if txt is None or len(txt) >= ARTICLE_MIN_TEXT_CHARS:
+            METRICS.inc("newsbot_article_fetch_total", path="not_modified" if txt is None else "lean")
+            return txt, canon, new_etag
+    except Exception:
+        METRICS.inc("newsbot_errors_total", where="article_lean")
+    with METRICS.timed("newsbot_call_seconds", call="article_newspaper"):
+        txt, np_canon = fetch_article_newspaper(url, html_bytes)
+    METRICS.inc("newsbot_article_fetch_total", path="newspaper" if txt else "empty")
+    return txt, np_canon or canon, new_etag
+
+def fetch_article(url: str):
+    txt, canon, _ = fetch_article_meta(url)
+    return txt or "", canon
+
+# --- Makale önbelleği (normalize_link -> metin + kanonik + ETag) ---
+
+def article_cache_get(conn, url: str):
+    """Dönüş: (metin, kanonik, etag, ts) | None"""
+    row = conn.execute("SELECT body, canon, etag, ts FROM article_cache WHERE url=?", (url,)).fetchone()
+    if not row:
+        return None
+    try:
+        text = zlib.decompress(row[0]).decode("utf-8")
+    except (zlib.error, UnicodeDecodeError, TypeError):
+        return None
+    return text, row[1] or "", row[2], int(row[3])
+
+# Önbellek yazan yardımcılar commit etmez: run_once aşama sonunda bir kez commit eder.
+
+def article_cache_put(conn, url: str, text: str, canon: str, etag):
+    body = zlib.compress(text.encode("utf-8"), 6)
+    conn.execute(
+        "INSERT OR REPLACE INTO article_cache (url, body, canon, etag, size, ts, used) "
+        "VALUES (?,?,?,?,?, strftime('%s','now'), strftime('%s','now'))",
+        (url, body, canon, etag, len(body))
+    )
+
+def article_cache_touch(conn, url: str, revalidated=False):
+    if revalidated:
+        conn.execute("UPDATE article_cache SET used = strftime('%s','now'), ts = strftime('%s','now') WHERE url=?", (url,))
+    else:
+        conn.execute("UPDATE article_cache SET used = strftime('%s','now') WHERE url=?", (url,))
+
+def prune_article_cache(conn):
+    """Toplam sıkıştırılmış boyut ARTICLE_CACHE_MAX_BYTES'ı aşarsa en eski kullanılanları sil."""
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM article_cache").fetchone()[0]
+    if total <= ARTICLE_CACHE_MAX_BYTES:
+        return
+    excess, doomed = total - ARTICLE_CACHE_MAX_BYTES, []
+    for url, size in conn.execute("SELECT url, size FROM article_cache ORDER BY used ASC"):
+        doomed.append((url,))
+        excess -= size
+        if excess <= 0:
+            break
+    with conn:
+        conn.executemany("DELETE FROM article_cache WHERE url=?", doomed)
+
+def fetch_article_cached(conn, url: str):
+    """
+    fetch_article + disk önbelleği. ARTICLE_CACHE_FRESH_HOURS içinde ağa çıkılmaz;
+    daha eskiyse ETag ile doğrulanır (304 -> önbellek). Dönüş: (metin, kanonik, önbellekten_mi)
+    """
+    cached = article_cache_get(conn, url)
+    if cached and time.time() - cached[3] < ARTICLE_CACHE_FRESH_HOURS * 3600:
+        article_cache_touch(conn, url)
+        METRICS.inc("newsbot_cache_total", cache="article", result="hit")
+        return cached[0], cached[1], True
+    txt, canon, etag = fetch_article_meta(url, cached[2] if cached else None)
+    if txt is None:
+        if cached:
+            article_cache_touch(conn, url, revalidated=True)
+            METRICS.inc("newsbot_cache_total", cache="article", result="revalidated")
+            return cached[0], cached[1], True
+        txt, canon = fetch_article(url)   # ETag'siz 304 olmamalı; güvenlik için tam çekim
+    METRICS.inc("newsbot_cache_total", cache="article", result="miss")
+    if txt:
+        article_cache_put(conn, url, txt, canon, etag)
+    return txt or "", canon, False
+
 # --- Dedupe yardımcıları ---
+# Yazan yardımcılar commit etmez: koşunun işaretleri run_once'ta tek transaction'da yazılır.
+
+def _chunks(items, n=300):
+    items = list(items)
+    for i in range(0, len(items), n):
+        yield items[i:i + n]
+
+def lookup_seen(conn, links=(), title_pks=(), ids=()):
+    """
+    Dedupe okumalarını tek sorguda yapar (seen_link + recent_title + seen).
+    Dönüş: (görülmüş linkler, TTL içindeki başlık anahtarları, görülmüş id'ler)
+    """
+    links, title_pks, ids = set(filter(None, links)), set(title_pks), set(ids)
+    found = {"l": set(), "t": set(), "i": set()}
+    cutoff = int(time.time()) - RECENT_TITLE_TTL_HRS * 3600
+    parts = {
+        "l": ("SELECT 'l', link FROM seen_link WHERE link IN ({})", links),
+        "t": ("SELECT 't', pk FROM recent_title WHERE ts > ? AND pk IN ({})", title_pks),
+        "i": ("SELECT 'i', id FROM seen WHERE id IN ({})", ids),
+    }
+    chunked = {k: list(_chunks(v)) for k, (_, v) in parts.items()}
+    for n in range(max((len(c) for c in chunked.values()), default=0)):
+        sql, params = [], []
+        for kind, (tmpl, _) in parts.items():
+            if n < len(chunked[kind]):
+                chunk = chunked[kind][n]
+                sql.append(tmpl.format(",".join("?" * len(chunk))))
+                if kind == "t":
+                    params.append(cutoff)
+                params.extend(chunk)
+        for kind, key in conn.execute(" UNION ALL ".join(sql), params):
+            found[kind].add(key)
+    if _state_snapshot is not None:
+        found["l"].update(l for l in links if _state_snapshot.has_link(l))
+        found["t"].update(pk for pk in title_pks if _state_snapshot.has_title(pk, cutoff))
+    return found["l"], found["t"], found["i"]
+
 def link_seen(conn, link: str) -> bool:
-    cur = conn.execute("SELECT 1 FROM seen_link WHERE link=?", (link,))
-    return cur.fetchone() is not None
+    return link in lookup_seen(conn, links=[link])[0]
 
 def mark_link_seen(conn, link: str):
     if not link:
         return
     conn.execute("INSERT OR IGNORE INTO seen_link (link, ts) VALUES (?, strftime('%s','now'))", (link,))
-    conn.commit()
 
 def already_seen(conn, _id: str) -> bool:
-    cur = conn.execute("SELECT 1 FROM seen WHERE id=?", (_id,))
-    return cur.fetchone() is not None
+    return _id in lookup_seen(conn, ids=[_id])[2]
 
 def mark_seen(conn, _id: str, title: str, link: str, category: str):
     conn.execute(
         "INSERT OR IGNORE INTO seen (id,title,link,category,ts) VALUES (?,?,?,?, strftime('%s','now'))",
         (_id, title, link, category)
     )
-    conn.commit()
+
+# --- Feed önbelleği (koşullu GET) ---
+def load_feed_cache(conn) -> dict:
+    """{url: (etag, last_modified, content_hash)}"""
+    rows = conn.execute("SELECT url, etag, last_modified, content_hash FROM feed_cache")
+    return {url: (etag, lm, h) for url, etag, lm, h in rows}
+
+def save_feed_cache(conn, url: str, validators):
+    etag, lm, h = validators
+    conn.execute(
+        "INSERT OR REPLACE INTO feed_cache (url, etag, last_modified, content_hash, ts) "
+        "VALUES (?,?,?,?, strftime('%s','now'))",
+        (url, etag, lm, h)
+    )
 
 # --- Başlık parmakizi (hafif ve agresif) ---
 def title_fp(title: str) -> str:
@@ -304,38 +1065,294 @@ def title_fp2(title: str) -> str:
     toks = sorted(set(toks))
     return " ".join(toks)
 
+def title_key(pub: str, t_fp2: str) -> str:
+    return f"{pub}::{t_fp2}"
+
 def recent_title_seen(conn, pub: str, t_fp2: str) -> bool:
-    pk = f"{pub}::{t_fp2}"
-    row = conn.execute("SELECT ts FROM recent_title WHERE pk=?", (pk,)).fetchone()
-    if not row:
-        return False
-    last = int(row[0])
-    return (time.time() - last) < RECENT_TITLE_TTL_HRS * 3600
+    return title_key(pub, t_fp2) in lookup_seen(conn, title_pks=[title_key(pub, t_fp2)])[1]
 
 def mark_recent_title(conn, pub: str, t_fp2: str):
-    pk = f"{pub}::{t_fp2}"
     conn.execute(
         "INSERT OR REPLACE INTO recent_title (pk, ts) VALUES (?, strftime('%s','now'))",
-        (pk,)
+        (title_key(pub, t_fp2),)
     )
-    conn.commit()
 
-# ----- Çeviri yardımcıları -----
+# --- Yakın-kopya indeksi (MinHash LSH) ---
+# Aynı haber farklı yayıncıda biraz farklı başlıkla gelir; title_fp2 birebir eşleşme
+# ister. Kelime kümelerinin Jaccard benzerliği MinHash imzasıyla tahmin edilir, LSH
+# bantları sayesinde sadece en az bir bandı tutan adaylar karşılaştırılır (tarama yok).
 
-def pretranslate_en(s: str) -> str:
-    if not s: return s
-    s = re.sub(r"\$?(\d+(\.\d+)?)\s?B\b", r"\1 billion", s, flags=re.IGNORECASE)
-    s = re.sub(r"\$?(\d+(\.\d+)?)\s?M\b", r"\1 million", s, flags=re.IGNORECASE)
-    s = re.sub(r"\$?(\d+(\.\d+)?)\s?K\b", r"\1 thousand", s, flags=re.IGNORECASE)
-    s = s.replace("’","'").replace("“","\"").replace("”","\"")
-    return s
+_ND_STOPWORDS = {
+    "the", "and", "for", "with", "after", "from", "this", "that", "his", "her", "their",
+    "new", "are", "was", "has", "have", "its", "into", "over", "about", "how", "why",
+    "what", "who", "you", "your", "will", "just", "now", "says", "said",
+    "bir", "ile", "için", "gibi", "daha", "olarak", "sonra", "çok", "kadar",
+}
+_ND_PRIME = (1 << 61) - 1
+_nd_rng = random.Random(0x5EED)
+_ND_PERMS = [(_nd_rng.randrange(1, _ND_PRIME), _nd_rng.randrange(0, _ND_PRIME))
+             for _ in range(NEAR_DUP_BANDS * NEAR_DUP_ROWS)]
+_ND_STRUCT = struct.Struct(f"<{len(_ND_PERMS)}I")
+
+def near_dup_tokens(title: str, lead: str = ""):
+    t = re.sub(r"[^\w]+", " ", fold_text(f"{title} {lead}"))
+    return {w for w in t.split() if len(w) > 2 and not w.isdigit() and w not in _ND_STOPWORDS}
+
+def near_dup_signature(title: str, lead: str = ""):
+    """MinHash imzası (32 bit değerler); 3'ten az anlamlı kelime varsa None (fazla riskli)."""
+    toks = near_dup_tokens(title, lead)
+    if len(toks) < 3:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(w.encode("utf-8"), digest_size=8).digest(), "little")
+              for w in toks]
+    return tuple(min((a * h + b) % _ND_PRIME for h in hashes) & 0xFFFFFFFF for a, b in _ND_PERMS)
+
+def near_dup_similarity(a, b) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+def near_dup_band_keys(sig):
+    keys = []
+    for band in range(NEAR_DUP_BANDS):
+        part = sig[band * NEAR_DUP_ROWS:(band + 1) * NEAR_DUP_ROWS]
+        raw = struct.pack(f"<H{NEAR_DUP_ROWS}I", band, *part)
+        keys.append(int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little", signed=True))
+    return keys
+
+class NearDupIndex:
+    """Koşu içi (bellek) + seen.db (NEAR_DUP_TTL_HRS) yakın-kopya araması."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.run_bands = {}   # bant anahtarı -> [(imza, sahip)]
+
+    def match(self, sig):
+        """Dönüş: (yakın-kopya mı, eşleşen koşu içi kaydın sahibi | None).
+
+        DB'deki (daha önce gönderilmiş) eşleşme önceliklidir ve sahip None döner.
+        """
+        if sig is None or NEAR_DUP_MIN_SIMILARITY <= 0:
+            return False, None
+        keys = near_dup_band_keys(sig)
+        if self.conn is not None:
+            cutoff = int(time.time()) - int(NEAR_DUP_TTL_HRS * 3600)
+            rows = self.conn.execute(
+                "SELECT DISTINCT n.sig FROM near_dup_band b JOIN near_dup n ON n.id = b.nid "
+                f"WHERE b.ts > ? AND b.key IN ({','.join('?' * len(keys))})",
+                (cutoff, *keys)
+            )
+            for (blob,) in rows:
+                if near_dup_similarity(sig, _ND_STRUCT.unpack(blob)) >= NEAR_DUP_MIN_SIMILARITY:
+                    return True, None
+        seen = set()
+        for k in keys:
+            for other, owner in self.run_bands.get(k, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                if near_dup_similarity(sig, other) >= NEAR_DUP_MIN_SIMILARITY:
+                    return True, owner
+        return False, None
+
+    def is_dup(self, sig) -> bool:
+        return self.match(sig)[0]
+
+    def add(self, sig, owner=None):
+        if sig is None:
+            return
+        for k in near_dup_band_keys(sig):
+            self.run_bands.setdefault(k, []).append((sig, owner))
+
+def mark_near_dup(conn, sig, ts=None):
+    """ts: kaydın zamanı (durum dosyasından geri yüklerken); verilmezse şimdi."""
+    if sig is None:
+        return
+    ts = int(ts or time.time())
+    cur = conn.execute("INSERT INTO near_dup (sig, ts) VALUES (?, ?)", (_ND_STRUCT.pack(*sig), ts))
+    conn.executemany(
+        "INSERT INTO near_dup_band (key, nid, ts) VALUES (?, ?, ?)",
+        [(k, cur.lastrowid, ts) for k in near_dup_band_keys(sig)]
+    )
 
-def postprocess_money_tr(s: str) -> str:
-    s = re.sub(r"\b([0-9]+(?:[.,][0-9]+)?)\s*million\b", r"\1 milyon", s, flags=re.IGNORECASE)
-    s = re.sub(r"\b([0-9]+(?:[.,][0-9]+)?)\s*billion\b", r"\1 milyar", s, flags=re.IGNORECASE)
-    s = re.sub(r"\b([0-9]+(?:[.,][0-9]+)?)\s*thousand\b", r"\1 bin", s, flags=re.IGNORECASE)
-    s = re.sub(r"\$\s*([0-9])", r"$\1", s)
-    return s
+def delivered_targets(conn, links, chat_ids=()) -> dict:
+    """
+    {link: {chat_id}} — bu linkin daha önce teslim edildiği hedefler. Durum dosyası
+    (GitHub Actions) sadece özet tuttuğu için orada chat_ids adayları sorgulanır.
+    """
+    links = set(links)
+    out = {}
+    for chunk in _chunks(links):
+        rows = conn.execute(
+            f"SELECT link, chat_id FROM delivered WHERE link IN ({','.join('?' * len(chunk))})", chunk
+        )
+        for link, chat_id in rows:
+            out.setdefault(link, set()).add(chat_id)
+    if _state_snapshot is not None:
+        for link in links:
+            for chat_id in chat_ids:
+                if _state_snapshot.has_delivery(chat_id, link):
+                    out.setdefault(link, set()).add(chat_id)
+    return out
+
+def mark_delivered(conn, items, sent=()):
+    """
+    Teslim işaretleri tek transaction'da (tek fsync). items: tüm hedeflerine teslim
+    edilen haberler (genel dedupe); sent: [(chat_id, link)] hedef başına teslimler.
+    """
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO delivered (chat_id, link, ts) VALUES (?, ?, strftime('%s','now'))",
+            list(sent)
+        )
+        for c in items:
+            mark_seen(conn, c["id"], c["title"], c["link"], c["category"])
+            mark_link_seen(conn, c["link"])
+            mark_link_seen(conn, c["norm_link"])
+            mark_recent_title(conn, c["pub"], c["t_fp2"])
+            mark_near_dup(conn, c.get("near_sig"))
+
+# --- Taşınabilir dedupe durumu (GitHub Actions) ---
+# Dosya: başlık (sihirli bayt, sürüm, kayıt sayıları) + zlib(sıralı [8 bayt hash, 4 bayt ts]
+# kayıtları: link, başlık, teslim; ardından [MinHash imzası, 4 bayt ts]: yakın-kopya).
+# Link/başlık/(chat_id, link) anahtarının kendisi değil SHA-1'inin ilk 8 baytı saklanır;
+# yakın-kopya imzaları açıktır (yüklemede seen.db'ye yazılır, NearDupIndex aynen sorgular).
+# Süresi dolan kayıtlar kaydederken atılır, dosya TTL içindeki gönderimlerle sınırlıdır.
+# Sürüm 1 dosyaları (sadece link + başlık) okunur.
+
+_SNAP_MAGIC   = b"NBST"
+_SNAP_VERSION = 2
+_SNAP_HEADER_V1 = struct.Struct("<4sHII")   # magic, sürüm, link sayısı, başlık sayısı
+_SNAP_HEADER  = struct.Struct("<4sHIIII")   # + yakın-kopya sayısı, teslim sayısı
+_SNAP_RECORD  = struct.Struct("<QI")        # hash, ts
+_SNAP_NEAR    = struct.Struct(f"<{_ND_STRUCT.size}sI")   # imza, ts
+
+class StateSnapshot:
+    """
+    seen_link + recent_title + delivered özetleri ({hash: ts}) ve near_dup imzaları
+    ({imza baytları: ts}); DB'deki tablolarla aynı TTL'ler.
+    """
+
+    def __init__(self, links=None, titles=None, near=None, delivered=None):
+        self.links  = links or {}
+        self.titles = titles or {}
+        self.near   = near or {}
+        self.delivered = delivered or {}
+
+    @staticmethod
+    def key(s: str) -> int:
+        return int.from_bytes(hashlib.sha1(s.encode("utf-8")).digest()[:8], "little")
+
+    def has_link(self, link: str) -> bool:
+        return self.key(link) in self.links
+
+    def has_title(self, pk: str, cutoff: int) -> bool:
+        return self.titles.get(self.key(pk), 0) > cutoff
+
+    def has_delivery(self, chat_id: str, link: str) -> bool:
+        return self.key(f"{chat_id}\n{link}") in self.delivered
+
+    def merge_db(self, conn):
+        """Bu koşuda DB'ye yazılan işaretleri ekler."""
+        for link, ts in conn.execute("SELECT link, ts FROM seen_link"):
+            h = self.key(link)
+            self.links[h] = max(self.links.get(h, 0), int(ts))
+        for pk, ts in conn.execute("SELECT pk, ts FROM recent_title"):
+            h = self.key(pk)
+            self.titles[h] = max(self.titles.get(h, 0), int(ts))
+        for chat_id, link, ts in conn.execute("SELECT chat_id, link, ts FROM delivered"):
+            h = self.key(f"{chat_id}\n{link}")
+            self.delivered[h] = max(self.delivered.get(h, 0), int(ts))
+        for sig, ts in conn.execute("SELECT sig, ts FROM near_dup"):
+            self.near[sig] = max(self.near.get(sig, 0), int(ts))
+
+    def restore_db(self, conn):
+        """Yakın-kopya imzalarını (taze) seen.db'ye yazar: NearDupIndex bant sorgusuyla bulur."""
+        have = {sig for (sig,) in conn.execute("SELECT sig FROM near_dup")}
+        with conn:
+            for sig, ts in self.near.items():
+                if sig not in have:
+                    mark_near_dup(conn, _ND_STRUCT.unpack(sig), ts)
+
+    def prune(self, now=None):
+        now = int(now or time.time())
+        link_cut  = now - int(RETENTION_DAYS["seen_link"] * 86400)
+        title_cut = now - RECENT_TITLE_TTL_HRS * 3600
+        near_cut  = now - int(NEAR_DUP_TTL_HRS * 3600)
+        deliv_cut = now - int(RETENTION_DAYS["delivered"] * 86400)
+        self.links  = {h: ts for h, ts in self.links.items() if ts > link_cut}
+        self.titles = {h: ts for h, ts in self.titles.items() if ts > title_cut}
+        self.near   = {sig: ts for sig, ts in self.near.items() if ts > near_cut}
+        self.delivered = {h: ts for h, ts in self.delivered.items() if ts > deliv_cut}
+
+    def to_bytes(self) -> bytes:
+        body = b"".join(_SNAP_RECORD.pack(h, ts)
+                        for table in (self.links, self.titles, self.delivered)
+                        for h, ts in sorted(table.items()))
+        body += b"".join(_SNAP_NEAR.pack(sig, ts) for sig, ts in sorted(self.near.items()))
+        head = _SNAP_HEADER.pack(_SNAP_MAGIC, _SNAP_VERSION, len(self.links), len(self.titles),
+                                 len(self.near), len(self.delivered))
+        return head + zlib.compress(body, 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "StateSnapshot":
+        magic, version = _SNAP_HEADER_V1.unpack_from(data)[:2]
+        if magic != _SNAP_MAGIC or version not in (1, _SNAP_VERSION):
+            raise ValueError(f"tanınmayan durum dosyası (sürüm {version})")
+        if version == 1:
+            header = _SNAP_HEADER_V1
+            n_links, n_titles = header.unpack_from(data)[2:]
+            n_near = n_deliv = 0
+        else:
+            header = _SNAP_HEADER
+            n_links, n_titles, n_near, n_deliv = header.unpack_from(data)[2:]
+        body = zlib.decompress(data[header.size:])
+        n_hashed = n_links + n_titles + n_deliv
+        if len(body) != n_hashed * _SNAP_RECORD.size + n_near * _SNAP_NEAR.size:
+            raise ValueError("durum dosyası kesik")
+        split = n_hashed * _SNAP_RECORD.size
+        records = list(_SNAP_RECORD.iter_unpack(body[:split]))
+        return cls(
+            links=dict(records[:n_links]),
+            titles=dict(records[n_links:n_links + n_titles]),
+            delivered=dict(records[n_links + n_titles:]),
+            near=dict(_SNAP_NEAR.iter_unpack(body[split:])),
+        )
+
+_state_snapshot = None   # load_state_snapshot() sonrası lookup_seen tarafından da sorgulanır
+
+def load_state_snapshot(path=None):
+    """Durum dosyasını okur (yoksa/bozuksa boş başlar). Dönüş: StateSnapshot"""
+    global _state_snapshot
+    path = path or STATE_SNAPSHOT_PATH
+    t0 = time.perf_counter()
+    snap = StateSnapshot()
+    try:
+        with open(path, "rb") as f:
+            snap = StateSnapshot.from_bytes(f.read())
+        snap.prune()
+        snap.restore_db(get_db())
+        log(f"Durum yüklendi: {len(snap.links)} link, {len(snap.titles)} başlık, "
+            f"{len(snap.near)} yakın-kopya, {len(snap.delivered)} teslim "
+            f"({os.path.getsize(path) // 1024} KB, {(time.perf_counter() - t0) * 1000:.1f} ms)")
+    except FileNotFoundError:
+        log("Durum dosyası yok, boş başlanıyor")
+    except (OSError, ValueError, struct.error, zlib.error, sqlite3.Error) as e:
+        log(f"Durum dosyası okunamadı, boş başlanıyor: {e}")
+    _state_snapshot = snap
+    return snap
+
+def save_state_snapshot(conn, path=None):
+    """Yüklenen durum + bu koşunun DB işaretleri, TTL'i geçenler atılarak yazılır."""
+    path = path or STATE_SNAPSHOT_PATH
+    snap = _state_snapshot or StateSnapshot()
+    snap.merge_db(conn)
+    snap.prune()
+    data = snap.to_bytes()
+    write_file_atomic(path, data)
+    METRICS.set("newsbot_state_snapshot_bytes", len(data))
+    log(f"Durum kaydedildi: {len(snap.links)} link, {len(snap.titles)} başlık, "
+        f"{len(snap.near)} yakın-kopya, {len(snap.delivered)} teslim ({len(data)} bayt)")
+
+# ----- Çeviri yardımcıları -----
 
 TITLE_VERB_MAP = [
     (r"\bleaks?\b", "ifşa etti"),
@@ -348,48 +1365,456 @@ TITLE_VERB_MAP = [
     (r"\bshuts? down\b", "kapatıldı"),
 ]
 
+class TextPipeline:
+    """
+    Çeviri öncesi/sonrası metin işlemleri. Tüm tablolar (özel isimler, para
+    birimleri, TITLE_VERB_MAP) kurulurken bir kez derlenir; her metin tablo
+    başına tek regex geçişinden geçer.
+    """
+    _EN_SCALE = {"b": "billion", "m": "million", "k": "thousand"}
+    _TR_SCALE = {"billion": "milyar", "million": "milyon", "thousand": "bin"}
+    _QUOTES   = str.maketrans({"’": "'", "“": "\"", "”": "\""})
+
+    def __init__(self, proper_nouns, title_verb_map):
+        # __PNi__ numarası uzunluğa göre sıralı listedeki sırası (uzun isim önce eşleşir)
+        names = sorted(proper_nouns, key=len, reverse=True)
+        self.pn_names = {name.lower(): (f"__PN{i}__", name) for i, name in enumerate(names)}
+        self.pn_re = re.compile(
+            r"\b(?:" + "|".join(re.escape(n) for n in names) + r")\b", re.IGNORECASE
+        ) if names else None
+        self.pn_key_re = re.compile(r"__PN\d+__")
+        self.en_money_re = re.compile(r"\$?(\d+(?:\.\d+)?)\s?([BMK])\b", re.IGNORECASE)
+        self.tr_money_re = re.compile(
+            r"\b([0-9]+(?:[.,][0-9]+)?)\s*(million|billion|thousand)\b", re.IGNORECASE
+        )
+        self.dollar_re = re.compile(r"\$\s*([0-9])")
+        self.space_re  = re.compile(r"\s+")
+        # TITLE_VERB_MAP -> tek alternation; hangi kuralın tuttuğu grup adından bulunur
+        self.verb_reps = [rep for _, rep in title_verb_map]
+        self.verb_re = re.compile(
+            "|".join(f"(?P<v{i}>{pat})" for i, (pat, _) in enumerate(title_verb_map)),
+            re.IGNORECASE
+        ) if title_verb_map else None
+
+    def protect(self, text: str):
+        """Özel isimleri tek geçişte __PNi__ yer tutucularıyla değiştirir. Dönüş: (metin, {anahtar: isim})"""
+        placeholders = {}
+        if not text or self.pn_re is None:
+            return text, placeholders
+        def sub(m):
+            key, name = self.pn_names[m.group(0).lower()]
+            placeholders[key] = name
+            return key
+        return self.pn_re.sub(sub, text), placeholders
+
+    def restore(self, tr: str, placeholders) -> str:
+        if not placeholders:
+            return tr
+        return self.pn_key_re.sub(lambda m: placeholders.get(m.group(0), m.group(0)), tr)
+
+    def pretranslate(self, s: str) -> str:
+        if not s: return s
+        s = self.en_money_re.sub(lambda m: f"{m.group(1)} {self._EN_SCALE[m.group(2).lower()]}", s)
+        return s.translate(self._QUOTES)
+
+    def postprocess_money(self, s: str) -> str:
+        s = self.tr_money_re.sub(lambda m: f"{m.group(1)} {self._TR_SCALE[m.group(2).lower()]}", s)
+        return self.dollar_re.sub(r"$\1", s)
+
+    def polish_title(self, tr: str) -> str:
+        if not tr: return tr
+        t = tr
+        if self.verb_re is not None:
+            t = self.verb_re.sub(lambda m: self.verb_reps[int(m.lastgroup[1:])], t)
+        t = self.space_re.sub(" ", t).strip()
+        if t and not t.endswith(('.', '!', '?')):
+            t = t[0].upper() + t[1:]
+        return t
+
+    def prepare(self, text: str):
+        """Çeviriye gidecek metin: yer tutucular + pretranslate + boşluk sadeleştirme."""
+        safe, placeholders = self.protect(text)
+        safe = self.space_re.sub(" ", self.pretranslate(safe)).strip()
+        return safe, placeholders
+
+    def finish(self, tr: str, placeholders, is_title=False) -> str:
+        tr = self.postprocess_money(self.restore(tr, placeholders))
+        if is_title:
+            tr = self.polish_title(tr)
+        return tr
+
+TEXT_PIPELINE = TextPipeline(PROPER_NOUNS, TITLE_VERB_MAP)
+
+def pretranslate_en(s: str) -> str:
+    return TEXT_PIPELINE.pretranslate(s)
+
+def postprocess_money_tr(s: str) -> str:
+    return TEXT_PIPELINE.postprocess_money(s)
+
 def polish_title_tr(tr: str) -> str:
-    if not tr: return tr
-    t = tr
-    for pat, rep in TITLE_VERB_MAP:
-        t = re.sub(pat, rep, t, flags=re.IGNORECASE)
-    t = re.sub(r"\s+", " ", t).strip()
-    if t and not t.endswith(('.', '!', '?')):
-        t = t[0].upper() + t[1:]
-    return t
-
-def translate_en_to_tr(text: str, is_title=False) -> str:
+    return TEXT_PIPELINE.polish_title(tr)
+
+def translation_key(safe: str, source="en", target="tr", backend=None) -> str:
+    """Önbellek anahtarı arka uca bağlıdır: "offline" çıktısı gerçek çevirinin yerine geçmez.
+    "google" eski anahtar biçimini korur (mevcut önbellek geçerli kalır)."""
+    backend = backend or TRANSLATE_BACKEND
+    prefix = "" if backend == "google" else f"{backend}:"
+    return hashlib.sha1(f"{prefix}{source}:{target}:{safe}".encode("utf-8")).hexdigest()
+
+# Çeviri önbelleği yardımcıları commit etmez: run_once çeviri aşamasının sonunda commit eder.
+
+def translation_cache_get(conn, keys) -> dict:
+    """{h: çeviri} — TTL içindekiler; bulunanların 'used' alanı güncellenir."""
+    keys = list(dict.fromkeys(keys))
+    if conn is None or not keys:
+        return {}
+    cutoff = int(time.time()) - TRANSLATION_CACHE_TTL_DAYS * 86400
+    found = {}
+    for i in range(0, len(keys), 500):   # sqlite parametre sınırı
+        chunk = keys[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT h, tr FROM translation_cache WHERE ts >= ? AND h IN ({marks})",
+            (cutoff, *chunk)
+        )
+        found.update(rows)
+    if found:
+        conn.executemany(
+            "UPDATE translation_cache SET used = strftime('%s','now') WHERE h = ?",
+            [(h,) for h in found]
+        )
+    return found
+
+def translation_cache_put(conn, pairs: dict):
+    if conn is None or not pairs:
+        return
+    conn.executemany(
+        "INSERT OR REPLACE INTO translation_cache (h, tr, ts, used) "
+        "VALUES (?, ?, strftime('%s','now'), strftime('%s','now'))",
+        list(pairs.items())
+    )
+
+def prune_translation_cache(conn):
+    """TTL'i geçenleri ve TRANSLATION_CACHE_MAX_ROWS üstündeki en eski kullanılanları sil."""
+    cutoff = int(time.time()) - TRANSLATION_CACHE_TTL_DAYS * 86400
+    conn.execute("DELETE FROM translation_cache WHERE ts < ?", (cutoff,))
+    conn.execute(
+        "DELETE FROM translation_cache WHERE h IN ("
+        " SELECT h FROM translation_cache ORDER BY used DESC LIMIT -1 OFFSET ?)",
+        (TRANSLATION_CACHE_MAX_ROWS,)
+    )
+    conn.commit()
+
+def translator_class():
+    global GoogleTranslator
+    if GoogleTranslator is None:
+        from deep_translator import GoogleTranslator as cls
+        GoogleTranslator = cls
+    return GoogleTranslator
+
+# --- Çeviri arka uçları ---
+# Arka uç: (source, target) ile kurulan, translate(metin) -> çeviri veren sınıf.
+# Nesne paket başına kurulur; deep_translator nesnesi istekler arasında durum
+# tuttuğu için iş parçacıkları arasında paylaşılmaz.
+
+class GoogleTranslateBackend:
+    def __init__(self, source="en", target="tr"):
+        self.translator = translator_class()(source=source, target=target)
+
+    def translate(self, text: str) -> str:
+        return self.translator.translate(text)
+
+class OfflineTranslateBackend:
+    """Ağ yok: metni aynen döner (satır yapısı korunur). latency: istek başına gecikme taklidi."""
+    latency = 0.0
+
+    def __init__(self, source="en", target="tr"):
+        self.source, self.target = source, target
+
+    def translate(self, text: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return text
+
+TRANSLATE_BACKENDS = {
+    "google":  GoogleTranslateBackend,
+    "offline": OfflineTranslateBackend,
+}
+
+def translation_backend(source="en", target="tr"):
+    try:
+        cls = TRANSLATE_BACKENDS[TRANSLATE_BACKEND]
+    except KeyError:
+        raise ValueError(f"bilinmeyen çeviri arka ucu: {TRANSLATE_BACKEND}") from None
+    return cls(source=source, target=target)
+
+def translate_chunk(chunk, source="en", target="tr") -> dict:
+    """
+    Bir paket: satırlar birleştirilip tek istek; satır sayısı tutmazsa tek tek.
+    Dönüş: {metin: çeviri} — sadece başarılı olanlar.
+    """
+    backend = translation_backend(source, target)
+
+    def request(text: str, mode: str):
+        with METRICS.timed("newsbot_call_seconds", call="translate"):
+            try:
+                tr = backend.translate(text)
+            except Exception:
+                METRICS.inc("newsbot_translate_requests_total", mode=mode, result="error")
+                raise
+        METRICS.inc("newsbot_translate_requests_total", mode=mode, result="ok")
+        return tr
+
+    out = {}
+    lines = None
+    if len(chunk) > 1:
+        try:
+            lines = (request("\n".join(chunk), "batch") or "").split("\n")
+        except Exception:
+            lines = None
+    if lines is not None and len(lines) == len(chunk):
+        out.update((src, tr.strip()) for src, tr in zip(chunk, lines))
+        return out
+    for src in chunk:
+        try:
+            tr = request(src, "single")
+        except Exception:
+            continue
+        if tr:
+            out[src] = tr
+    return out
+
+def translate_batch(texts, source="en", target="tr") -> dict:
+    """
+    Metinleri TRANSLATE_BATCH_CHARS'lık paketlere böler; paketler en fazla
+    TRANSLATE_WORKERS iş parçacığıyla aynı anda çevrilir (translate_chunk).
+    Dönüş: {metin: çeviri} — sadece başarılı olanlar.
+    """
+    chunks, cur, size = [], [], 0
+    for t in texts:
+        if cur and size + len(t) + 1 > TRANSLATE_BATCH_CHARS:
+            chunks.append(cur)
+            cur, size = [], 0
+        cur.append(t)
+        size += len(t) + 1
+    if cur:
+        chunks.append(cur)
+    out = {}
+    if len(chunks) <= 1 or TRANSLATE_WORKERS <= 1:
+        for chunk in chunks:
+            out.update(translate_chunk(chunk, source, target))
+        return out
+    workers = min(TRANSLATE_WORKERS, len(chunks))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as pool:
+        for part in pool.map(lambda c: translate_chunk(c, source, target), chunks):
+            out.update(part)
+    return out
+
+# --- Kaynak dil (ucuz) ---
+# Türkçe'ye özgü harfler (ğ ı ş İ) + sık geçen işlev kelimeleri İngilizce karşılıklarıyla
+# sayılır; sözlük/model yok. "Kılıçdaroğlu says ..." gibi İngilizce metinde İngilizce
+# işlev kelimeleri ağır basar.
+
+_TR_LETTERS   = frozenset("ğışĞİŞ")
+_TR_STOPWORDS = frozenset(("ve", "bir", "bu", "için", "ile", "da", "de", "olarak", "ama", "çok",
+                           "daha", "gibi", "sonra", "oldu", "olan", "ne", "mi", "ise", "yeni",
+                           "kadar", "değil", "her", "şu", "ya", "en", "o"))
+_EN_STOPWORDS = frozenset(("the", "and", "of", "to", "in", "is", "for", "on", "with", "that",
+                           "a", "an", "as", "at", "by", "from", "his", "her", "after", "are", "was"))
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+def is_turkish(text: str) -> bool:
+    if not text:
+        return False
+    words = _WORD_RE.findall(text.lower())
+    tr = sum(w in _TR_STOPWORDS for w in words)
+    en = sum(w in _EN_STOPWORDS for w in words)
+    if any(ch in _TR_LETTERS for ch in text):
+        return tr >= en
+    return tr >= 2 and en == 0
+
+def translate_many_en_to_tr(items, conn=None):
+    """
+    items: [(metin, is_title)] -> [çeviri]. Yer tutucu + pretranslate_en sonrası metin
+    önce sqlite önbelleğinde aranır; kalanlar tek seferde (toplu) çevrilir.
+    Aynı metin koşu içinde bir kez çevrilir.
+    """
+    prepared = []
+    for text, is_title in items:
+        if not text:
+            prepared.append(None)
+            continue
+        safe, placeholders = TEXT_PIPELINE.prepare(text)
+        prepared.append((safe, placeholders, is_title))
+
+    keys = {p[0]: translation_key(p[0]) for p in prepared if p}
+    cached = translation_cache_get(conn, keys.values())
+    done = {safe: cached[h] for safe, h in keys.items() if h in cached}
+    missing = [safe for safe in keys if safe not in done]
+    METRICS.inc("newsbot_cache_total", len(done), cache="translation", result="hit")
+    METRICS.inc("newsbot_cache_total", len(missing), cache="translation", result="miss")
+    if missing:
+        fresh = translate_batch(missing)
+        translation_cache_put(conn, {keys[src]: tr for src, tr in fresh.items()})
+        done.update(fresh)
+
+    out = []
+    for (text, _), p in zip(items, prepared):
+        if p is None:
+            out.append(text)
+            continue
+        safe, placeholders, is_title = p
+        out.append(TEXT_PIPELINE.finish(done.get(safe, safe), placeholders, is_title))
+    return out
+
+def translate_en_to_tr(text: str, is_title=False, conn=None) -> str:
     if not text: return text
-    placeholders = {}
-    safe = text
-    for i, name in enumerate(sorted(PROPER_NOUNS, key=len, reverse=True)):
-        key = f"__PN{i}__"
-        placeholders[key] = name
-        safe = re.sub(rf"\b{name}\b", key, safe, flags=re.IGNORECASE)
-    safe = pretranslate_en(safe)
+    return translate_many_en_to_tr([(text, is_title)], conn)[0]
+
+def translate_candidates(candidates, conn=None):
+    """
+    Adaylara title_tr / text_tr yazar (toplu, önbellekli). Türkçe kaynaklı haber
+    (başlık + özet birlikte bakılır) olduğu gibi kalır.
+    """
+    for c in candidates:
+        c["title_tr"], c["text_tr"] = c["title"], c["summary_en"]
+    foreign = [c for c in candidates
+               if not (TRANSLATE_SKIP_TURKISH and is_turkish(f"{c['title']} {c['summary_en']}"))]
+    METRICS.inc("newsbot_translate_skipped_total", len(candidates) - len(foreign), reason="turkish")
+    jobs = []
+    if TRANSLATE_TITLES:
+        jobs += [(c["title"], True) for c in foreign]
+    if TRANSLATE_SUMMARIES:
+        jobs += [(c["summary_en"], False) for c in foreign]
+    translated = iter(translate_many_en_to_tr(jobs, conn))
+    if TRANSLATE_TITLES:
+        for c in foreign:
+            c["title_tr"] = next(translated)
+    if TRANSLATE_SUMMARIES:
+        for c in foreign:
+            c["text_tr"] = next(translated)
+
+# ----- Özetleme (süreç havuzu) -----
+
+# süreç başına bir kez kurulur (havuz işçisi veya ana süreç)
+_summary_tokenizer  = None
+_summary_summarizer = None
+_summary_init_tried = False   # kurulamadıysa her çağrıda tekrar denenmez / loglanmaz
+_summary_pool = None
+
+def _init_summarizer():
+    # havuz initializer'ı hata fırlatırsa tüm havuz bozulur; hata summarize_en'de yakalanır
+    global _summary_tokenizer, _summary_summarizer, _summary_init_tried
+    _summary_init_tried = True
     try:
-        tr = GoogleTranslator(source="en", target="tr").translate(safe)
-    except Exception:
-        tr = safe
-    for key, name in placeholders.items():
-        tr = tr.replace(key, name)
-    tr = postprocess_money_tr(tr)
-    if is_title:
-        tr = polish_title_tr(tr)
-    return tr
+        from sumy.nlp.tokenizers import Tokenizer
+        from sumy.summarizers.lsa import LsaSummarizer
+        _summary_tokenizer  = Tokenizer("english")
+        _summary_summarizer = LsaSummarizer()
+    except Exception as e:
+        _summary_tokenizer = _summary_summarizer = None
+        reason = " ".join(str(e).split())[:160]
+        log(f"Özetleyici kurulamadı (python main.py --setup çalıştırıldı mı?): {reason}")
+
+def setup_nlp() -> bool:
+    """Kurulum adımı: eksik NLTK verisini indirir (import'ta ağ/disk işi yapılmaz)."""
+    import nltk
+    ok = True
+    for name in NLTK_DATA:
+        try:
+            nltk.data.find(f"tokenizers/{name}")
+            log(f"NLTK {name}: mevcut")
+        except LookupError:
+            log(f"NLTK {name}: indiriliyor")
+            ok = nltk.download(name, quiet=True) and ok
+    return ok
+
+def ensure_nlp():
+    """
+    Daemon / yerel çalıştırma açılışında bir kez: kurulum adımı (--setup) olmadan da
+    NLTK verisi indirilir. Olmazsa yüksek sesle uyarılır (özetler ham metin kesiti olur).
+    """
+    try:
+        ok = setup_nlp()
+    except Exception as e:
+        ok = False
+        log(f"NLTK kurulum hatası: {e}")
+    if not ok:
+        METRICS.inc("newsbot_errors_total", where="nlp_setup")
+        log("UYARI: NLTK verisi (punkt) kurulamadı — özetleyici çalışmayacak, "
+            "haberler özetsiz/kırpılmış gider. 'python main.py --setup' ile kurun.")
+    return ok
+
+def clip_summary_input(text: str) -> str:
+    """SUMMARY_MAX_CHARS'ı aşan metni (mümkünse cümle sonunda) kırpar."""
+    if not SUMMARY_MAX_CHARS or len(text) <= SUMMARY_MAX_CHARS:
+        return text
+    cut = text[:SUMMARY_MAX_CHARS]
+    end = cut.rfind(". ")
+    return cut[:end + 1] if end > SUMMARY_MAX_CHARS // 2 else cut
 
 def summarize_en(text: str, n_sent: int) -> str:
     text = re.sub(r"\s+", " ", (text or "").strip())
     if len(text.split()) < 60:
         return text
+    text = clip_summary_input(text)
     try:
-        parser = PlaintextParser.from_string(text, Tokenizer("english"))
-        summarizer = LsaSummarizer()
-        sents = summarizer(parser.document, n_sent)
+        from sumy.parsers.plaintext import PlaintextParser
+        if not _summary_init_tried:
+            _init_summarizer()
+        if _summary_summarizer is None:
+            return text
+        parser = PlaintextParser.from_string(text, _summary_tokenizer)
+        sents = _summary_summarizer(parser.document, n_sent)
         return " ".join(str(s) for s in sents)
     except Exception:
         return text
 
+def summary_pool():
+    """
+    Özet süreç havuzu. fork yerine forkserver (yoksa spawn): havuz feed/Telegram iş
+    parçacıkları ve açık sqlite bağlantısı varken kurulur; fork bunların kilitlerini
+    kopyalayıp çocuk süreci kilitleyebilir.
+    """
+    global _summary_pool
+    if _summary_pool is None:
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        _summary_pool = ProcessPoolExecutor(max_workers=SUMMARY_WORKERS, initializer=_init_summarizer,
+                                            mp_context=ctx)
+    return _summary_pool
+
+def shutdown_summary_pool():
+    global _summary_pool
+    if _summary_pool is not None:
+        _summary_pool.shutdown(cancel_futures=True)
+        _summary_pool = None
+
+def summarize_batch(texts, n_sent: int):
+    """
+    Metin listesini özetler; LSA (SVD) gerektirenler süreç havuzuna dağıtılır,
+    böylece ana süreç (feed/Telegram G/Ç) bloklanmaz ve çekirdekler kullanılır.
+    """
+    out = [re.sub(r"\s+", " ", (t or "").strip()) for t in texts]
+    heavy = [i for i, t in enumerate(out) if len(t.split()) >= 60]
+    if not heavy:
+        return out
+    if SUMMARY_WORKERS <= 0 or len(heavy) == 1:
+        for i in heavy:
+            out[i] = summarize_en(out[i], n_sent)
+        return out
+    try:
+        done = summary_pool().map(summarize_en, [out[i] for i in heavy], [n_sent] * len(heavy))
+        for i, summary in zip(heavy, done):
+            out[i] = summary
+    except BrokenProcessPool as e:
+        log(f"Özet havuzu çöktü, ana süreçte devam: {e}")
+        METRICS.inc("newsbot_errors_total", where="summary_pool")
+        shutdown_summary_pool()
+        for i in heavy:
+            out[i] = summarize_en(out[i], n_sent)
+    return out
+
 def bullets_tr(paragraph: str) -> str:
     if not paragraph: return paragraph
     sents = re.split(r"(?<=[.!?])\s+", paragraph)
@@ -399,37 +1824,350 @@ def bullets_tr(paragraph: str) -> str:
     sents = sents[:5]
     return "• " + "\n• ".join(sents)
 
-def tg_send(text: str):
-    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
-        log("Telegram ENV eksik: TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID")
-        return
-    try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+# ----- Mesaj biçimi (tekil / özet) -----
+
+MESSAGE_HEADER = "🟢 Platcorn & Creator"
+
+def format_item_message(c) -> str:
+    """Tek haber mesajı; c: title_tr / text_tr alanları doldurulmuş aday."""
+    return (
+        f"{MESSAGE_HEADER}\n"
+        f"<b>{escape_html(c['title_tr'])}</b>\n"
+        f"Kaynak: {c['pub']} ({host_of(c['link'])})\n\n"
+        f"{escape_html(bullets_tr(c['text_tr']))}\n\n"
+        f"🔗 {c['link']}"
+    )
+
+def clip_text(s: str, limit: int) -> str:
+    """limit'i aşan metni kelime sınırında keser ('…' ekler)."""
+    s = (s or "").strip()
+    if len(s) <= limit:
+        return s
+    cut = s[:limit].rsplit(" ", 1)[0].rstrip(",;:")
+    return cut + "…"
+
+def digest_group(c) -> str:
+    if DIGEST_GROUP_BY == "keyword":
+        hits = keyword_hits(c["title"], CORE_KEYWORDS)
+        return hits[0] if hits else "diğer"
+    if DIGEST_GROUP_BY == "category":
+        return c["category"]
+    return c["pub"]
+
+def format_digest_item(c) -> str:
+    return (
+        f"▪️ <b>{escape_html(c['title_tr'])}</b>\n"
+        f"{escape_html(clip_text(c['text_tr'], DIGEST_ITEM_CHARS))}\n"
+        f"🔗 {c['link']}"
+    )
+
+def build_digest_messages(items, limit=TG_MAX_MESSAGE_CHARS):
+    """
+    Haberleri gruplar (DIGEST_GROUP_BY, ilk görülme sırası) ve TG_MAX_MESSAGE_CHARS'a
+    sığacak şekilde en az sayıda mesaja paketler. Grup bir mesajdan taşarsa sonraki
+    mesajda başlığı "(devam)" ile tekrarlanır. Dönüş: [(mesaj, [haber])]
+    """
+    groups = {}
+    for c in items:
+        groups.setdefault(digest_group(c), []).append(c)
+
+    out, parts, batch = [], [], []
+    head_room = len(f"{MESSAGE_HEADER} — özet (999 haber)")
+    used, last_group = head_room, None
+
+    def flush():
+        nonlocal used, last_group
+        if batch:
+            head = f"{MESSAGE_HEADER} — özet ({len(batch)} haber)"
+            out.append(("\n\n".join([head] + parts), list(batch)))
+        parts.clear()
+        batch.clear()
+        used, last_group = head_room, None
+
+    for group, members in groups.items():
+        for i, c in enumerate(members):
+            item = format_digest_item(c)
+            titled = f"<b>📰 {escape_html(group)}</b>{' (devam)' if i else ''}\n{item}"
+            block = item if last_group == group else titled
+            if batch and used + 2 + len(block) > limit:
+                flush()
+                block = titled
+            parts.append(block)
+            batch.append(c)
+            used += 2 + len(block)
+            last_group = group
+    flush()
+    return out
+
+_digest_pending = []     # DIGEST_WINDOW_SECONDS içinde biriken (henüz gönderilmemiş) adaylar
+_digest_started = 0.0    # biriken ilk adayın zamanı
+
+def digest_take(candidates, window: float, now=None):
+    """
+    Adayları bekleme kuyruğuna ekler; pencere dolduysa (ya da window=0) hepsini
+    gönderilmek üzere döner, dolmadıysa [] döner.
+    """
+    global _digest_started
+    now = now or time.time()
+    if candidates and not _digest_pending:
+        _digest_started = now
+    _digest_pending.extend(candidates)
+    if window > 0 and now - _digest_started < window:
+        return []
+    ready = list(_digest_pending)
+    _digest_pending.clear()
+    return ready
+
+def digest_seconds_left(now=None) -> float:
+    if not _digest_pending:
+        return float("inf")
+    return max(0.0, _digest_started + DIGEST_WINDOW_SECONDS - (now or time.time()))
+
+# ----- Çoklu kanal yönlendirme -----
+
+def route_rules():
+    if not ROUTES:
+        return [{"chat_ids": [TELEGRAM_CHAT_ID]}]
+    return ROUTES
+
+def route_targets(category: str, title: str):
+    """Haberin gideceği chat_id'ler (kural sırasıyla, tekil)."""
+    targets = []
+    for rule in route_rules():
+        cats, kws = rule.get("categories") or (), rule.get("keywords") or ()
+        if (cats or kws) and category not in cats and not text_matches_keywords_whole_words(title, kws):
+            continue
+        for chat_id in rule.get("chat_ids") or ():
+            chat_id = str(chat_id).strip()
+            if (chat_id or not ROUTES) and chat_id not in targets:
+                targets.append(chat_id)
+    return targets
+
+# ----- Telegram gönderim kuyruğu -----
+
+class TelegramDelivery:
+    """
+    Mesajları arka plan iş parçacığında sırayla gönderir (tek keep-alive Session).
+    429'da Telegram'ın retry_after süresine uyar, ağ/5xx hatalarında üstel geri
+    çekilmeyle tekrar dener. submit() bir Future döner; sonucu TG_SENT, TG_RETRY
+    (geçici hata) ya da TG_REJECTED (400/403 gibi kalıcı ret) olur.
+    """
+
+    def __init__(self, token: str, chat_id: str):
+        self.url = f"{TELEGRAM_API_BASE}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.session = requests.Session()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="telegram", daemon=True)
+        self.thread.start()
+
+    def submit(self, text: str) -> Future:
+        fut = Future()
+        self.queue.put((text, fut))
+        return fut
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.session.close()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            text, fut = item
+            if fut.set_running_or_notify_cancel():
+                with METRICS.timed("newsbot_call_seconds", call="telegram"):
+                    result = self._send(text)
+                METRICS.inc("newsbot_telegram_total", result=result)
+                fut.set_result(result)
+
+    def _send(self, text: str) -> str:
         payload = {
-            "chat_id": TELEGRAM_CHAT_ID,
+            "chat_id": self.chat_id,
             "text": text,
             "parse_mode": "HTML",
             "disable_web_page_preview": False,
         }
-        r = requests.post(url, json=payload, timeout=30)
-        r.raise_for_status()
-    except Exception as e:
-        log(f"Telegram gönderim hatası: {e}")
+        delay = TG_BACKOFF_SECONDS
+        for attempt in range(1, TG_MAX_ATTEMPTS + 1):
+            try:
+                r = self.session.post(self.url, json=payload, timeout=TG_TIMEOUT_SECONDS)
+            except requests.RequestException as e:
+                log(f"Telegram bağlantı hatası ({attempt}/{TG_MAX_ATTEMPTS}): {e}")
+                METRICS.inc("newsbot_telegram_retries_total", reason="network")
+            else:
+                if r.ok:
+                    return TG_SENT
+                if r.status_code == 429:
+                    try:
+                        wait = float(r.json().get("parameters", {}).get("retry_after", delay))
+                    except ValueError:
+                        wait = float(r.headers.get("Retry-After") or delay)
+                    log(f"Telegram hız sınırı: {wait:.0f} sn bekleniyor")
+                    METRICS.inc("newsbot_telegram_retries_total", reason="rate_limit")
+                    time.sleep(wait)
+                    continue
+                if r.status_code < 500:
+                    # 400/403 vb. kalıcı: tekrar denemek anlamsız
+                    log(f"Telegram gönderim hatası: {r.status_code} {r.text[:200]}")
+                    return TG_REJECTED
+                log(f"Telegram sunucu hatası ({attempt}/{TG_MAX_ATTEMPTS}): {r.status_code}")
+                METRICS.inc("newsbot_telegram_retries_total", reason="server")
+            if attempt < TG_MAX_ATTEMPTS:
+                time.sleep(delay)
+                delay *= 2
+        return TG_RETRY
+
+_tg_deliveries = {}   # chat_id -> TelegramDelivery (hedefler birbirini beklemez)
+
+def tg_delivery(chat_id=None):
+    """Süreç boyunca hedef başına tek gönderim kuyruğu (ENV eksikse None)."""
+    chat_id = chat_id or TELEGRAM_CHAT_ID
+    if not TELEGRAM_BOT_TOKEN or not chat_id:
+        return None
+    sender = _tg_deliveries.get(chat_id)
+    if sender is None:
+        sender = _tg_deliveries[chat_id] = TelegramDelivery(TELEGRAM_BOT_TOKEN, chat_id)
+    return sender
+
+def close_tg_deliveries():
+    """Kuyruktakileri gönderip iş parçacıklarını kapatır."""
+    while _tg_deliveries:
+        _tg_deliveries.popitem()[1].close()
+
+def tg_send_async(text: str, chat_id=None) -> Future:
+    sender = tg_delivery(chat_id)
+    if sender is None:
+        log("Telegram ENV eksik: TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID")
+        fut = Future()
+        fut.set_result(TG_RETRY)
+        return fut
+    return sender.submit(text)
+
+def tg_send(text: str, chat_id=None) -> bool:
+    return tg_send_async(text, chat_id).result() == TG_SENT
 
 # ----- Keyword yardımcıları -----
 
+# Türkçe büyük İ -> i (lower() "i̇" üretir), kıvrık kesme işaretleri -> '
+_KW_FOLD = str.maketrans({"İ": "i", "’": "'", "‘": "'"})
+
+def fold_text(s: str) -> str:
+    return (s or "").translate(_KW_FOLD).lower()
+
+class KeywordMatcher:
+    """
+    Keyword listesini bir kez tek bir alternation regex'e derler; metin tek geçişte
+    taranır (kelime başına ayrı re.search yok). Çok kelimeli ifadeler ve Türkçe
+    harfler (\b Unicode) desteklenir; uzun ifadeler önce denenir. IGNORECASE
+    şart: fold_text "I"yı "i" yapar, "tartışma" ancak böyle "TARTIŞMA"yı bulur.
+    """
+    __slots__ = ("keywords", "_any", "_all", "_order", "_prefixes")
+
+    def __init__(self, keywords):
+        kws = []
+        for kw in keywords or ():
+            kw = fold_text(kw).strip()
+            if kw and kw not in kws:
+                kws.append(kw)
+        self.keywords = tuple(kws)
+        self._any = self._all = None
+        if kws:
+            self._order = sorted(kws, key=len, reverse=True)
+            alt = "|".join(re.escape(k) for k in self._order)
+            self._any = re.compile(rf"\b(?:{alt})\b", re.IGNORECASE)
+            # lookahead: iç içe geçen eşleşmeler de (ör. "content creator" + "creator");
+            # keyword başına grup: metindeki yazım değil keyword'ün kendisi döner
+            groups = "|".join(f"({re.escape(k)})" for k in self._order)
+            self._all = re.compile(rf"\b(?=(?:{groups})\b)", re.IGNORECASE)
+            # aynı konumda başlayan kısa keyword'ler (ör. "exclusive deal" -> "exclusive")
+            self._prefixes = {
+                k: [p for p in self._order
+                    if len(p) < len(k) and k.startswith(p) and re.match(rf"{re.escape(p)}\b", k)]
+                for k in self._order
+            }
+
+    def search(self, text: str) -> bool:
+        if not text or self._any is None:
+            return False
+        return self._any.search(fold_text(text)) is not None
+
+    def hits(self, text: str):
+        """Metinde geçen keyword'ler (ilk görülme sırasıyla, tekil)."""
+        if not text or self._all is None:
+            return []
+        found = {}
+        for m in self._all.finditer(fold_text(text)):
+            kw = self._order[m.lastindex - 1]
+            found[kw] = None
+            found.update(dict.fromkeys(self._prefixes[kw]))
+        return list(found)
+
+@lru_cache(maxsize=32)
+def _keyword_matcher(keywords: tuple) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+def keyword_matcher(keywords) -> KeywordMatcher:
+    return _keyword_matcher(tuple(keywords or ()))
+
 def text_matches_keywords_whole_words(text: str, keywords) -> bool:
     if not text or not keywords:
         return False
-    t = text.lower()
-    for kw in keywords:
-        kw = kw.lower().strip()
-        if not kw:
-            continue
-        pat = r"\b" + re.escape(kw) + r"\b"
-        if re.search(pat, t, flags=re.IGNORECASE):
-            return True
-    return False
+    return keyword_matcher(keywords).search(text)
+
+def keyword_hits(text: str, keywords):
+    if not text or not keywords:
+        return []
+    return keyword_matcher(keywords).hits(text)
+
+class KeywordScorer:
+    """
+    CORE/GLOBAL/kategori keyword'lerinin ağırlıkları (KEYWORD_WEIGHTS ile) bir kez
+    tek bir KeywordMatcher + {keyword: ağırlık} indeksine derlenir; başlık tek geçişte
+    puanlanır (her tekil keyword bir kez sayılır, CORE dışı toplam SCORE_GLOBAL_CAP'te kesilir).
+    """
+    __slots__ = ("matcher", "weights", "core")
+
+    def __init__(self, core, global_, category=()):
+        weights = {}
+        for kws, w in ((category, SCORE_GLOBAL_WEIGHT), (global_, SCORE_GLOBAL_WEIGHT),
+                       (core, SCORE_CORE_WEIGHT)):
+            for kw in kws:
+                weights[fold_text(kw).strip()] = w
+        for kw, w in KEYWORD_WEIGHTS.items():
+            weights[fold_text(kw).strip()] = w
+        weights.pop("", None)
+        self.weights = weights
+        self.core = frozenset(fold_text(kw).strip() for kw in core)
+        self.matcher = KeywordMatcher(weights)
+
+    def score(self, text: str) -> float:
+        core = other = 0.0
+        for k in self.matcher.hits(text):
+            if k in self.core:
+                core += self.weights[k]
+            else:
+                other += self.weights[k]
+        return core + min(other, SCORE_GLOBAL_CAP)
+
+@lru_cache(maxsize=32)
+def _keyword_scorer(cat_keywords: tuple) -> KeywordScorer:
+    return KeywordScorer(CORE_KEYWORDS, GLOBAL_KEYWORDS, cat_keywords)
+
+def keyword_scorer(cat_keywords) -> KeywordScorer:
+    return _keyword_scorer(tuple(cat_keywords or ()))
+
+def priority_score(title: str, cat_keywords, pub: str, ts, corroboration=0, now=None) -> float:
+    """Kısa listedeki haberin öncelik puanı (büyük = önce)."""
+    now = now or time.time()
+    score = keyword_scorer(cat_keywords).score(title)
+    score += PUBLISHER_WEIGHTS.get(pub, 0.0)
+    if ts:
+        score += SCORE_FRESH_WEIGHT * 0.5 ** (max(0.0, now - ts) / (SCORE_FRESH_HALF_LIFE_MINUTES * 60))
+    score += SCORE_CORROBORATION_WEIGHT * min(corroboration, SCORE_CORROBORATION_MAX)
+    return round(score, 3)
 
 def entry_matches_keywords(title: str, body: str, kw_list) -> bool:
     t = (title or "")
@@ -443,6 +2181,301 @@ def entry_matches_keywords(title: str, body: str, kw_list) -> bool:
         return False
     return True
 
+# ----- Eşzamanlı feed indirme -----
+
+_http_local = threading.local()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+def http_session() -> requests.Session:
+    """İş parçacığı başına tek keep-alive Session."""
+    s = getattr(_http_local, "session", None)
+    if s is None:
+        s = requests.Session()
+        s.headers["User-Agent"] = USER_AGENT
+        _http_local.session = s
+    return s
+
+def host_slot(host: str) -> threading.BoundedSemaphore:
+    with _host_slots_lock:
+        sem = _host_slots.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(FEED_PER_HOST_LIMIT)
+            _host_slots[host] = sem
+        return sem
+
+# ----- Akışlı feed ayrıştırma -----
+# Gövde indirilirken parça parça XMLPullParser'a verilir; her giriş kapanınca küçük
+# bir FeedEntry kaydına çevrilip XML öğesi boşaltılır. İlk FEED_SCAN_ENTRIES girişte
+# ya da (tarih sıralı feed'de, FEED_GAP_SAMPLE zaman toplandıktan sonra) tazelik
+# kapısından eski ilk girişte durulur; gövdenin kalanı indirilmez, ayrıştırılmaz.
+# RSS 2.0 / RSS 1.0 (RDF) / Atom dışı biçim, bozuk XML (ör. tanımsız &nbsp;) veya
+# okunamayan tarih -> feedparser'a düşülür; onun sonucu da hemen kayda çevrilir.
+
+class FeedEntry:
+    """Feed girişinden koşunun kullandığı tek şey: link, başlık, unix zamanı (yoksa None)."""
+    __slots__ = ("link", "title", "ts")
+
+    def __init__(self, link: str, title: str, ts=None):
+        self.link = link
+        self.title = title
+        self.ts = ts
+
+    def __repr__(self):
+        return f"FeedEntry({self.link!r}, {self.title!r}, {self.ts!r})"
+
+_FEED_ROOTS     = ("rss", "feed", "RDF")
+_FEED_ITEMS     = ("item", "entry")
+_FEED_PUBLISHED = ("pubDate", "published", "issued", "date")   # date = dc:date
+_FEED_UPDATED   = ("updated", "modified")
+_FEED_CHUNK     = 64 * 1024
+
+def _xml_name(tag) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+def parse_feed_date(s: str) -> int:
+    """RFC 822 (RSS) ya da ISO 8601 (Atom, dc:date) -> unix ts. Okunamazsa ValueError."""
+    s = s.strip()
+    try:
+        if s[:4].isdigit():
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00").replace("z", "+00:00"))
+        else:
+            dt = parsedate_to_datetime(s)
+    except (TypeError, ValueError, IndexError) as e:
+        raise ValueError(f"tarih okunamadı: {s[:40]!r}") from e
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+def _feed_entry(elem, base_url: str) -> FeedEntry:
+    title = link = guid = published = updated = None
+    for child in elem:
+        name = _xml_name(child.tag)
+        if name == "title" and title is None:
+            title = "".join(child.itertext()).strip()   # feedparser gibi: işaretleme olduğu gibi
+        elif name == "link" and not link:
+            href = child.get("href")
+            if href is None:
+                link = (child.text or "").strip()
+            elif child.get("rel", "alternate") == "alternate":
+                link = urljoin(base_url, href.strip())
+        elif name == "guid" and child.get("isPermaLink", "true") != "false":
+            guid = (child.text or "").strip()
+        elif name in _FEED_PUBLISHED and published is None and (child.text or "").strip():
+            published = child.text
+        elif name in _FEED_UPDATED and updated is None and (child.text or "").strip():
+            updated = child.text
+    if not link and guid and guid.startswith(("http://", "https://")):
+        link = guid
+    stamp = published or updated
+    return FeedEntry(link or "", title if title is not None else "(başlıksız)",
+                     parse_feed_date(stamp) if stamp else None)
+
+def _feed_pieces(chunks):
+    """Parçaları en fazla _FEED_CHUNK'lık dilimlere böler (erken durunca az iş yapılır)."""
+    if isinstance(chunks, (bytes, bytearray)):
+        chunks = (chunks,)
+    for data in chunks:
+        for i in range(0, len(data), _FEED_CHUNK):
+            yield data[i:i + _FEED_CHUNK]
+
+def parse_feed_stream(chunks, base_url: str, since=None, limit=FEED_SCAN_ENTRIES):
+    """
+    chunks: gövde byte'ları ya da parça akışı; durulduğunda akışın kalanı okunmaz.
+    İlk `limit` girişi FeedEntry listesi olarak döndürür. since verilirse, feed o ana
+    kadar yeniden eskiye sıralıysa ve en az FEED_GAP_SAMPLE giriş zamanı okunduysa,
+    since'ten eski ilk giriş (dahil) son okunandır.
+    Tanınmayan biçim / bozuk XML / okunamayan tarih: ValueError ya da ET.ParseError.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    entries = []
+    root = None
+    last_ts = None
+    dated = 0
+    ordered = True
+    for piece in _feed_pieces(chunks):
+        parser.feed(piece)
+        for event, elem in parser.read_events():
+            if root is None:
+                root = elem
+                if _xml_name(elem.tag) not in _FEED_ROOTS:
+                    raise ValueError(f"bilinmeyen feed kökü: {_xml_name(elem.tag)}")
+            if event != "end" or _xml_name(elem.tag) not in _FEED_ITEMS:
+                continue
+            e = _feed_entry(elem, base_url)
+            elem.clear()
+            entries.append(e)
+            if e.ts is not None:
+                ordered = ordered and (last_ts is None or e.ts <= last_ts)
+                last_ts = e.ts
+                dated += 1
+            if len(entries) >= limit:
+                return entries
+            # yoklama planı (schedule_after_poll) yayın aralığını bu zamanlardan tahmin eder
+            if since is not None and ordered and e.ts is not None and e.ts < since and dated >= FEED_GAP_SAMPLE:
+                return entries
+    if root is None:
+        raise ValueError("boş feed")
+    # close() çağrılmaz: FEED_MAX_BYTES'ta kesilmiş gövdede de okunan girişler geçerli
+    return entries
+
+def parse_feed_entries(data, base_url: str, content_type: str = "", since=None,
+                       limit=FEED_SCAN_ENTRIES):
+    """
+    data: gövde byte'ları ya da parça akışı. Önce akışlı ayrıştırıcı (akış durduğu yerde
+    bırakılır); olmazsa gövdenin tamamı okunup feedparser'a verilir.
+    Dönüş: [FeedEntry] (en fazla limit).
+    """
+    if isinstance(data, (bytes, bytearray)):
+        data = (data,)
+    body = bytearray()
+
+    def consumed():
+        for chunk in data:
+            body.extend(chunk)
+            yield chunk
+
+    chunks = consumed()
+    try:
+        entries = parse_feed_stream(chunks, base_url, since, limit)
+        METRICS.inc("newsbot_feed_parse_total", path="stream")
+        return entries
+    except (ET.ParseError, ValueError):
+        pass
+    for _ in chunks:   # feedparser tüm gövdeyi ister
+        pass
+    METRICS.inc("newsbot_feed_parse_total", path="feedparser")
+    d = feedparser.parse(bytes(body), response_headers={"content-location": base_url, "content-type": content_type})
+    return [
+        FeedEntry(getattr(e, "link", "") or "", getattr(e, "title", "(başlıksız)"), entry_unix_ts(e))
+        for e in d.entries[:limit]
+    ]
+
+def _abort_response(r, expired: threading.Event):
+    """Süre doldu: soket kapatılır, bekleyen okuma (iter_content) hemen döner."""
+    expired.set()
+    sock = getattr(getattr(r.raw, "connection", None), "sock", None)
+    if sock is None:   # "Connection: close" yanıtında soket sadece yanıtın dosya nesnesinde
+        fp = getattr(getattr(r.raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(fp, "raw", None), "_sock", None)
+    try:
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+def fetch_feed(feed_url: str, cached=None, since=None):
+    """
+    Feed'i indirirken girişleri FeedEntry kayıtlarına çevirir (host sınırı + timeout +
+    FEED_MAX_BYTES; parse_feed_entries, since = feed'in tazelik kapısı). Ayrıştırıcı
+    durunca bağlantı kapatılır, gövdenin kalanı indirilmez. İstek + indirme en fazla
+    FEED_DEADLINE_SECONDS sürer; aşılırsa TimeoutError.
+    cached=(etag, last_modified, content_hash) ise koşullu GET yapılır; 304 ya da
+    aynı gövde (okunan kısmın özeti) gelirse entries=None döner.
+    Dönüş: (entries | None, (etag, last_modified, content_hash))
+    """
+    etag, last_mod, old_hash = cached or (None, None, None)
+    req_headers = {}
+    if etag:
+        req_headers["If-None-Match"] = etag
+    if last_mod:
+        req_headers["If-Modified-Since"] = last_mod
+    with host_slot(host_of(feed_url).lower()):
+        deadline = time.monotonic() + FEED_DEADLINE_SECONDS
+        with METRICS.timed("newsbot_call_seconds", call="feed_download"):
+            with http_session().get(feed_url, headers=req_headers, timeout=FEED_TIMEOUT_SECONDS,
+                                    stream=True) as r:
+                if r.status_code == 304:
+                    return None, (etag, last_mod, old_hash)
+                r.raise_for_status()
+                digest = hashlib.sha1()
+                left = FEED_MAX_BYTES
+                # okuma zaman aşımı her okumada yenilenir; toplam süreyi bekçi zamanlayıcı keser
+                expired = threading.Event()
+                watchdog = threading.Timer(max(0.0, deadline - time.monotonic()), _abort_response, (r, expired))
+                watchdog.daemon = True
+
+                def chunks():
+                    nonlocal left
+                    try:
+                        for chunk in r.iter_content(_FEED_CHUNK):
+                            if expired.is_set():
+                                break
+                            chunk = chunk[:left]
+                            digest.update(chunk)
+                            left -= len(chunk)
+                            yield chunk
+                            if left <= 0:
+                                return
+                    except (requests.RequestException, OSError):
+                        if not expired.is_set():
+                            raise
+                    if expired.is_set():
+                        raise TimeoutError(f"feed {FEED_DEADLINE_SECONDS} sn içinde inmedi")
+
+                watchdog.start()
+                try:
+                    entries = parse_feed_entries(chunks(), r.url or feed_url, r.headers.get("Content-Type", ""),
+                                                 since, max(MAX_ITEMS_PER_FEED, FEED_SCAN_ENTRIES))
+                finally:
+                    watchdog.cancel()
+    # with bloğundan çıkınca yanıt kapanır: okunmayan gövde indirilmez
+    validators = (
+        r.headers.get("ETag") or None,
+        r.headers.get("Last-Modified") or None,
+        digest.hexdigest(),
+    )
+    if old_hash and validators[2] == old_hash:
+        return None, validators
+    return entries, validators
+
+def fetch_feeds(feed_urls, cache=None, since=None):
+    """
+    Tüm feed'leri paralel indirir; koşu süresi toplamı değil en yavaş feed'i izler.
+    cache: load_feed_cache() çıktısı (koşullu GET için). since: {feed_url: tazelik kapısı}.
+    Dönüş: {feed_url: (entries | None, validators | None, hata | None)} — girdi sırası
+    korunur. entries=None ve hata=None ise feed değişmemiştir.
+    """
+    cache = cache or {}
+    since = since or {}
+    results = {}
+    if not feed_urls:
+        return results
+    workers = max(1, min(FEED_FETCH_WORKERS, len(feed_urls)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed") as pool:
+        futures = {url: pool.submit(fetch_feed, url, cache.get(url), since.get(url)) for url in feed_urls}
+        for url, fut in futures.items():
+            try:
+                parsed, validators = fut.result()
+                results[url] = (parsed, validators, None)
+            except Exception as e:
+                results[url] = (None, None, e)
+    return results
+
+def title_keyword_stage(title: str, cat_keywords):
+    """
+    Makale çekilmeden, sadece başlıkla yapılan keyword kontrolü.
+    Dönüş: (core_ok, kw_ok) — core_ok=False ise haber elenir; kw_ok=False ise
+    GLOBAL/kategori eşleşmesi ancak gövdede (SEARCH_IN_SUMMARY) aranabilir.
+    """
+    if not text_matches_keywords_whole_words(title or "", CORE_KEYWORDS):
+        return False, False
+    kw_ok = (
+        text_matches_keywords_whole_words(title, GLOBAL_KEYWORDS)
+        or not cat_keywords
+        or text_matches_keywords_whole_words(title, cat_keywords)
+    )
+    return True, kw_ok
+
+def body_keyword_stage(body: str, cat_keywords) -> bool:
+    """Başlık GLOBAL/kategori kelimesi içermiyorsa gövdede ara (SEARCH_IN_SUMMARY)."""
+    if not SEARCH_IN_SUMMARY or not body:
+        return False
+    return (
+        text_matches_keywords_whole_words(body, GLOBAL_KEYWORDS)
+        or text_matches_keywords_whole_words(body, cat_keywords)
+    )
+
 def build_feed_catalog():
     catalog = {}
     for cat, spec in CATEGORIES.items():
@@ -462,12 +2495,16 @@ def hc_url(suffix: str = "") -> str:
         suffix = "/" + suffix
     return base.rstrip("/") + suffix
 
-def ping_healthcheck(suffix: str = ""):
+def ping_healthcheck(suffix: str = "", body: str = None):
+    """body verilirse POST ile gönderilir (healthchecks.io ping gövdesini olay kaydında gösterir)."""
     url = hc_url(suffix)
     if not url:
         return
     try:
-        requests.get(url, timeout=10)
+        if body is None:
+            requests.get(url, timeout=10)
+        else:
+            requests.post(url, data=body.encode("utf-8")[:100_000], timeout=10)
     except Exception as e:
         log(f"healthcheck ping başarısız ({suffix}): {e}")
 
@@ -475,123 +2512,472 @@ def ping_healthcheck(suffix: str = ""):
 # ÇALIŞTIRMA
 # =======================
 
-def run_once():
+# run_once'ın eleme aşamaları (log / ölçüm sırası)
+DROP_STAGES = ("taze", "link", "baslik", "benzer", "yas", "keyword", "rota", "butce", "kanonik", "govde", "id")
+
+def run_once(feed_urls=None, digest_window=0):
+    """
+    feed_urls verilirse sadece o feed'ler (zamanı gelenler) yoklanır.
+    digest_window: DIGEST_MODE'da adaylar bu kadar saniye biriktirilir (0 = bu koşuda gönder).
+    Dönüş: koşu hatasız bittiyse True.
+    """
     ping_healthcheck("start")
+    METRICS.begin_cycle()
+    t_cycle = time.perf_counter()
 
-    conn = init_db()
+    conn = get_db()
     catalog = build_feed_catalog()
+    if feed_urls is not None:
+        catalog = {u: cat for u, cat in catalog.items() if u in set(feed_urls)}
+    started = time.time()
+    schedule = load_feed_schedule(conn)
+    new_schedule = {}
     sent_total = 0
+    sent_pairs = []
+    rejected_pairs = []
     run_seen_links  = set()
     run_seen_titles = set()
+    for c in _digest_pending:   # özet penceresinde bekleyenler tekrar aday olmasın
+        run_seen_links.update((c["link"], c["norm_link"]))
+        run_seen_titles.add(c["run_title_key"])
+    drops = Counter()   # aşama başına elenen giriş sayısı
+    fetched = 0
+    article_hits = 0    # makale önbelleğinden gelenler
+    candidates = []     # tüm aşamaları geçen haberler (özet/çeviri/gönderim bekliyor)
+    done_feeds = []     # [(feed_url, validators)] — koşu sonunda feed_cache'e yazılır
+    retry_feeds = set() # haberi teslim edilemeyen / bütçeye sığmayan feed'ler: doğrulayıcı/last_ok yazılmaz
+    fresh = []
+    unchanged = feed_errors = entries = 0
+    stage_secs = {}     # aşama -> duvar saati süresi (sn)
+    error = None
+    schedule_saved = False
+
+    def stage_done(stage: str, t0: float, secs=None):
+        secs = time.perf_counter() - t0 if secs is None else secs
+        stage_secs[stage] = round(secs, 3)
+        METRICS.observe("newsbot_stage_seconds", secs, stage=stage)
 
     try:
+        t0 = time.perf_counter()
+        fresh_since = {u: feed_fresh_since(schedule.get(u), started) for u in catalog}
+        feeds = fetch_feeds(list(catalog), load_feed_cache(conn), fresh_since)
+        stage_done("feeds", t0)
+
+        # A0) Tazelik kapısı (feed'in son başarılı yoklamasından beri) — kalan
+        # girişlerin anahtarları tek seferde hazırlanır
+        t_filter = time.perf_counter()
         for feed_url, category in catalog.items():
-            try:
-                d = feedparser.parse(feed_url)
-                entries = d.entries[:MAX_ITEMS_PER_FEED]
-            except Exception as e:
-                log(f"Feed hatası: {feed_url} -> {e}")
+            d, validators, err = feeds[feed_url]
+            st = schedule.get(feed_url)
+            if err is not None:
+                log(f"Feed hatası: {feed_url} -> {err}")
+                feed_errors += 1
+                METRICS.inc("newsbot_feed_polls_total", result="error")
+                METRICS.inc("newsbot_feed_errors_total", feed=feed_url)
+                new_schedule[feed_url] = schedule_after_poll(st, started, "error")
+                continue
+            done_feeds.append((feed_url, validators))
+            if d is None:
+                unchanged += 1   # 304 / aynı gövde: parse yok, yeni giriş yok
+                METRICS.inc("newsbot_feed_polls_total", result="unchanged")
+                METRICS.inc("newsbot_cache_total", cache="feed", result="hit")
+                new_schedule[feed_url] = schedule_after_poll(st, started, "unchanged")
                 continue
+            METRICS.inc("newsbot_feed_polls_total", result="ok")
+            METRICS.inc("newsbot_cache_total", cache="feed", result="miss")
+            new_schedule[feed_url] = schedule_after_poll(
+                st, started, "ok", [e.ts for e in d[:FEED_SCAN_ENTRIES]]
+            )
+            since = fresh_since[feed_url]
+            for e in d[:MAX_ITEMS_PER_FEED]:
+                entries += 1
+                if not is_new_enough(e, since):
+                    drops["taze"] += 1
+                    continue
+                norm_link = normalize_link(e.link)
+                title = e.title
+                pub = publisher_of(norm_link)
+                fresh.append((e, category, norm_link, title, pub, title_fp(title), title_fp2(title), feed_url))
+
+        # DB dedupe okumaları koşu başına tek sorgu
+        db_links, db_titles, _ = lookup_seen(
+            conn,
+            links=[f[2] for f in fresh],
+            title_pks=[title_key(f[4], f[6]) for f in fresh],
+        )
 
+        near_dups = NearDupIndex(conn)
+        for c in _digest_pending:
+            near_dups.add(c["near_sig"])
+        # Kısa liste: ucuz aşamaları geçen girişler koşu içi kopyalarıyla kümelenir
+        # (link / yayıncı::başlık / yakın-kopya). Koşu içi işaretler burada değil,
+        # B/C aşamalarını geçen üye aday olunca alınır; sahip elenirse sıradaki üye denenir.
+        shortlist = []
+        by_link, by_title = {}, {}
+        for e, category, norm_link, title, pub, t_fp, t_fp2, feed_url in fresh:
             cat_keywords = CATEGORIES.get(category, {}).get("keywords", [])
 
-            for e in entries:
-                raw_link = getattr(e, "link", "") or ""
-                norm_link = normalize_link(raw_link)
-                title = getattr(e, "title", "(başlıksız)")
-
-                # 0) 15 dk tazelik kapısı
-                if not is_new_enough(e):
-                    continue
-
-                # 1) Makale çek (kanonik + metin)
-                base_text, canon = fetch_article(norm_link)
-                canon_link = normalize_link(canon) if canon else ""
-                primary_link = canon_link or norm_link
+            # --- A) Ucuz aşamalar: sadece feed girdisi ---
+            # A1) Normalize link dedupe (bekleyen özet ve DB)
+            if norm_link in run_seen_links or norm_link in db_links:
+                drops["link"] += 1
+                continue
 
-                # 2) Link dedupe (koşu içi ve DB)
-                if primary_link in run_seen_links or norm_link in run_seen_links:
-                    continue
-                if link_seen(conn, primary_link) or link_seen(conn, norm_link):
-                    continue
+            # A2) Başlık parmakizi (bekleyen özet + 72 saatlik DB)
+            if f"{pub}::{t_fp}" in run_seen_titles or title_key(pub, t_fp2) in db_titles:
+                drops["baslik"] += 1
+                continue
 
-                # 3) Başlık parmakizi (koşu içi + 72 saatlik DB)
-                pub  = publisher_of(primary_link)
-                t_fp  = title_fp(title)
-                t_fp2 = title_fp2(title)
-                run_title_key = f"{pub}::{t_fp}"
-                if run_title_key in run_seen_titles:
-                    continue
-                if recent_title_seen(conn, pub, t_fp2):
+            # A2b) Yayıncılar arası yakın-kopya başlık (72 saatlik DB); kısa listedeki
+            # bir habere benzeyen giriş elenmez, o haberin kümesine girer
+            near_sig, near_owner = None, None
+            if not NEAR_DUP_USE_LEAD:
+                near_sig = near_dup_signature(title)
+                dup, near_owner = near_dups.match(near_sig)
+                if dup and near_owner is None:
+                    drops["benzer"] += 1
                     continue
 
-                # 4) Yaş filtresi (güvence)
-                if is_too_old(e):
-                    continue
+            # A3) Yaş filtresi (güvence)
+            if is_too_old(e):
+                drops["yas"] += 1
+                continue
 
-                # 5) Keyword filtresi
-                plain_text = re.sub(r"<[^>]+>", " ", base_text or "")
-                plain_text = re.sub(r"\s+", " ", plain_text).strip()
-                if STRICT_KEYWORDS:
-                    if not entry_matches_keywords(title, plain_text, GLOBAL_KEYWORDS):
-                        if not entry_matches_keywords(title, plain_text, cat_keywords):
-                            continue
-
-                # 6) Deterministik ID
-                ts = entry_unix_ts(e)
-                _id = f"{primary_link}|{ts or ''}"
-                if already_seen(conn, _id):
+            # A4) Başlıkta CORE + GLOBAL/kategori keyword
+            kw_ok = True
+            if STRICT_KEYWORDS:
+                core_ok, kw_ok = title_keyword_stage(title, cat_keywords)
+                if not core_ok or (not kw_ok and not SEARCH_IN_SUMMARY):
+                    drops["keyword"] += 1
                     continue
 
-                # 7) Özet + çeviri
-                summary_en = summarize_en(plain_text, SUMMARY_SENTENCES)
-                title_out  = translate_en_to_tr(title, is_title=True) if TRANSLATE_TITLES else title
-                text_tr    = translate_en_to_tr(summary_en, is_title=False) if TRANSLATE_SUMMARIES else summary_en
-                text_final = escape_html(bullets_tr(text_tr))
-                title_out  = escape_html(title_out)
-
-                msg = (
-                    "🟢 Platcorn & Creator\n"
-                    f"<b>{title_out}</b>\n"
-                    f"Kaynak: {pub} ({host_of(primary_link)})\n\n"
-                    f"{text_final}\n\n"
-                    f"🔗 {primary_link}"
-                )
+            # A5) Yönlendirme: hiçbir hedefe gitmeyecek haber için makale çekilmez
+            targets = route_targets(category, title)
+            if not targets:
+                drops["rota"] += 1
+                continue
 
-                try:
-                    tg_send(msg)
-                    # Link & ID işaretleri
-                    mark_seen(conn, _id, title, primary_link, category)
-                    mark_link_seen(conn, primary_link)
-                    mark_link_seen(conn, norm_link)
-                    # Başlık-parmakizi işaretle (72 saatlik)
-                    mark_recent_title(conn, pub, t_fp2)
-                    # Koşu içi işaretler
-                    run_seen_links.add(primary_link)
-                    run_seen_links.add(norm_link)
-                    run_seen_titles.add(run_title_key)
-                    sent_total += 1
-                    time.sleep(0.8)
-                except Exception as ex:
-                    log(f"Gönderim hatası: {title} -> {ex}")
-
-        log(f"Gönderilen yeni özet: {sent_total}")
-        ping_healthcheck("")   # success
+            item = {
+                "e": e, "feed": feed_url, "category": category, "cat_keywords": cat_keywords, "norm_link": norm_link,
+                "title": title, "pub": pub, "t_fp": t_fp, "t_fp2": t_fp2, "near_sig": near_sig,
+                "kw_ok": kw_ok, "targets": targets, "alts": [],
+            }
+            # A6) Koşu içi kopya: ilk gelen kümenin sahibi, sonrakiler yedeği
+            run_title_key = f"{pub}::{t_fp}"
+            for owner, reason in ((by_link.get(norm_link), "link"),
+                                  (by_title.get(run_title_key), "baslik"),
+                                  (near_owner, "benzer")):
+                if owner is not None:
+                    owner["alts"].append((item, reason))
+                    break
+            else:
+                by_link[norm_link] = item
+                by_title[run_title_key] = item
+                near_dups.add(near_sig, item)
+                shortlist.append(item)
+
+        # A7) Öncelik: puan sırasıyla (eşitlikte feed sırası); bütçe makale çekmeden önce.
+        # Teyit = kümedeki farklı yayıncı sayısı
+        for item in shortlist:
+            corroboration = len({alt["pub"] for alt, _ in item["alts"]} - {item["pub"]})
+            item["score"] = priority_score(item["title"], item["cat_keywords"], item["pub"],
+                                           item["e"].ts, corroboration, started)
+        shortlist.sort(key=lambda item: item["score"], reverse=True)
+
+        def article_stage(item):
+            """B/C aşamaları; dönüş: (aday | None, eleme aşaması | None)."""
+            nonlocal article_secs, article_hits, fetched
+            e, category, cat_keywords = item["e"], item["category"], item["cat_keywords"]
+            norm_link, title, pub = item["norm_link"], item["title"], item["pub"]
+            t_fp, t_fp2, near_sig = item["t_fp"], item["t_fp2"], item["near_sig"]
+
+            # --- B) Pahalı aşama: makale çek (kanonik + metin) ---
+            t0 = time.perf_counter()
+            base_text, canon, from_cache = fetch_article_cached(conn, norm_link)
+            article_secs += time.perf_counter() - t0
+            if from_cache:
+                article_hits += 1
+            else:
+                fetched += 1
+            canon_link = normalize_link(canon) if canon else ""
+            primary_link = canon_link or norm_link
+
+            # --- C) Kanonik link + ID ile dedupe tekrarı (tek sorgu) ---
+            _id = f"{primary_link}|{e.ts or ''}"
+            canon_pub = publisher_of(primary_link)
+            seen_links, seen_titles, seen_ids = lookup_seen(
+                conn,
+                links=[primary_link] if primary_link != norm_link else [],
+                title_pks=[title_key(canon_pub, t_fp2)] if canon_pub != pub else [],
+                ids=[_id],
+            )
+            if norm_link in run_seen_links:
+                return None, "link"
+            if primary_link != norm_link:
+                if primary_link in run_seen_links or seen_links:
+                    return None, "kanonik"
+                if canon_pub != pub:
+                    pub = canon_pub
+                    if f"{pub}::{t_fp}" in run_seen_titles or seen_titles:
+                        return None, "kanonik"
+            run_title_key = f"{pub}::{t_fp}"
+            if run_title_key in run_seen_titles:
+                return None, "baslik"
+
+            # C1) Gövde keyword (başlık GLOBAL/kategori tutmadıysa)
+            plain_text = re.sub(r"<[^>]+>", " ", base_text or "")
+            plain_text = re.sub(r"\s+", " ", plain_text).strip()
+            if not item["kw_ok"] and not body_keyword_stage(plain_text, cat_keywords):
+                return None, "govde"
+
+            # C2) Deterministik ID
+            if seen_ids:
+                return None, "id"
+
+            # C3) Yakın-kopya, başlık + ilk paragraf (NEAR_DUP_USE_LEAD)
+            if NEAR_DUP_USE_LEAD:
+                near_sig = near_dup_signature(title, plain_text[:300])
+                if near_dups.is_dup(near_sig):
+                    return None, "benzer"
+                near_dups.add(near_sig)
+
+            # Aday: link/başlık (kanonik dahil) koşu içinde ancak şimdi işaretlenir
+            run_seen_links.update((norm_link, primary_link))
+            run_seen_titles.add(run_title_key)
+            return {
+                "id": _id, "title": title, "category": category, "pub": pub,
+                "link": primary_link, "norm_link": norm_link, "t_fp2": t_fp2,
+                "near_sig": near_sig, "text": clip_summary_input(plain_text), "run_title_key": run_title_key,
+                "targets": item["targets"], "score": item["score"], "feed": item["feed"],
+            }, None
+
+        article_secs = 0.0
+        for owner in shortlist:
+            members = [(owner, None)] + owner["alts"]
+            if CYCLE_SEND_BUDGET and len(candidates) >= CYCLE_SEND_BUDGET:
+                # Bütçe dışı: işaret alınmadı; feed önbelleği saklanmaz, sonraki döngüde yeniden gelir
+                drops["butce"] += 1
+                for alt, reason in owner["alts"]:
+                    drops[reason] += 1
+                retry_feeds.update(m["feed"] for m, _ in members)
+                continue
+            for i, (item, _) in enumerate(members):
+                cand, reason = article_stage(item)
+                if cand is None:
+                    drops[reason] += 1
+                    continue
+                candidates.append(cand)
+                for alt, alt_reason in members[i + 1:]:
+                    drops[alt_reason] += 1
+                break
+        if shortlist:
+            top = shortlist[0]
+            log(f"Öncelik: kısa liste {len(shortlist)}, en yüksek {top['score']} ({top['title'][:60]})"
+                + (f", bütçe {CYCLE_SEND_BUDGET}" if CYCLE_SEND_BUDGET else ""))
+
+        conn.commit()   # makale önbelleği yazımları: aşama başına tek commit
+        # filtre süresi = döngü süresi - makale çekme süresi
+        stage_done("filter", t_filter, time.perf_counter() - t_filter - article_secs)
+        stage_done("article", t_filter, article_secs)
+
+        # --- D) Özet (süreç havuzu) ---
+        t0 = time.perf_counter()
+        # gövde metni özetten sonra tutulmaz (özet penceresinde bekleyenler dahil)
+        summaries = summarize_batch([c.pop("text") for c in candidates], SUMMARY_SENTENCES)
+        for c, summary_en in zip(candidates, summaries):
+            c["summary_en"] = summary_en
+        stage_done("summarize", t0)
+
+        # --- E) Çeviri + gönderim: çevirisi biten parça hemen kuyruğa atılır, kuyruk
+        # (hedef başına iş parçacığı) gönderirken sonraki parça çevrilir. Özet modunda
+        # mesajlar ancak tüm haberler hazır olunca kurulabilir. Her haber bir kez
+        # hazırlanır, eşleşen her hedefe (daha önce teslim edilmediyse) gider.
+        # Özet modunda bir mesaj birden çok haber taşır; işaretler yine haber başına,
+        # sadece mesajı teslim edilen haberlere uygulanır.
+        deliveries = []
+        translate_secs = 0.0
+
+        def set_todo(items):
+            already = delivered_targets(conn, [c["link"] for c in items],
+                                        {t for c in items for t in c["targets"]})
+            for c in items:
+                c["todo"] = [t for t in c["targets"] if t not in already.get(c["link"], ())]
+
+        def submit(items):
+            for chat_id in dict.fromkeys(t for c in items for t in c["todo"]):
+                group = [c for c in items if chat_id in c["todo"]]
+                if DIGEST_MODE:
+                    batches = build_digest_messages(group)
+                else:
+                    batches = [(format_item_message(c), [c]) for c in group]
+                deliveries.extend((chat_id, b_items, tg_send_async(msg, chat_id)) for msg, b_items in batches)
+
+        t_send = time.perf_counter()
+        if DIGEST_MODE:
+            t0 = time.perf_counter()
+            translate_candidates(candidates, conn)
+            translate_secs += time.perf_counter() - t0
+            ready = digest_take(candidates, digest_window)
+            if _digest_pending:
+                log(f"Özet penceresinde bekleyen: {len(_digest_pending)} haber")
+            set_todo(ready)
+            submit(ready)
+        else:
+            ready = candidates
+            set_todo(ready)
+            for i in range(0, len(ready), max(1, SEND_CHUNK_ITEMS)):
+                chunk = ready[i:i + max(1, SEND_CHUNK_ITEMS)]
+                t0 = time.perf_counter()
+                translate_candidates(chunk, conn)
+                translate_secs += time.perf_counter() - t0
+                submit(chunk)
+        conn.commit()   # çeviri önbelleği yazımları: aşama başına tek commit
+        stage_done("translate", t_send, translate_secs)
+
+        t0 = time.perf_counter()   # gönderim: kuyruktaki son mesajların teslimi beklenir
+        sent_pairs = []       # [(chat_id, link)]
+        rejected_pairs = []   # kalıcı ret (400/403): tekrar denemek aynı reddi alır
+        for chat_id, items, fut in deliveries:
+            label = items[0]["title"] if len(items) == 1 else f"özet mesajı ({len(items)} haber)"
+            try:
+                result = fut.result()
+            except Exception as ex:
+                log(f"Gönderim hatası: {label} -> {ex}")
+                continue
+            if result == TG_RETRY:
+                log(f"Gönderilemedi (sonraki koşuda tekrar denenecek): {label}")
+                continue
+            pairs = [(chat_id, c["link"]) for c in items]
+            if result == TG_REJECTED:
+                log(f"Telegram reddetti (tekrar denenmeyecek): {chat_id} -> {label}")
+                rejected_pairs += pairs
+                continue
+            sent_pairs += pairs
+        # reddedilen çiftler bitmiş sayılır: feed retry_feeds'te bekletilmez
+        rejected = set(rejected_pairs)
+        done = set(sent_pairs) | rejected
+        # genel dedupe işaretleri sadece tüm hedeflerine ulaşan haberler için
+        delivered = [c for c in ready if all((t, c["link"]) in done for t in c["todo"])]
+        sent_total = len(delivered) - sum(
+            1 for c in delivered if c["todo"] and all((t, c["link"]) in rejected for t in c["todo"]))
+        # (haber, hedef) çiftlerinden biri bile teslim edilmediyse ya da haber özet
+        # penceresinde bekliyorsa feed'in doğrulayıcıları ve last_ok'u ilerletilmez:
+        # sonraki koşu tam gövdeyi çeker, haber tazelik kapısından yine geçer
+        delivered_ids = {id(c) for c in delivered}
+        retry_feeds.update(c["feed"] for c in ready if id(c) not in delivered_ids)
+        retry_feeds.update(c["feed"] for c in _digest_pending)
+        stage_done("send", t0)
+
+        # --- F) Koşu sonu yazımları ---
+        t0 = time.perf_counter()
+        # Link/ID/başlık işaretleri sadece teslim onaylananlar için, tek transaction'da
+        mark_delivered(conn, delivered, sent_pairs + rejected_pairs)
+        # doğrulayıcılar feed'ler işlendikten sonra yazılır (yarıda kalan koşu tekrar denenir)
+        with conn:
+            for feed_url, validators in done_feeds:
+                if feed_url not in retry_feeds:
+                    save_feed_cache(conn, feed_url, validators)
+            for feed_url, st in new_schedule.items():
+                if feed_url in retry_feeds:
+                    st = {**st, "last_ok": (schedule.get(feed_url) or {}).get("last_ok")}
+                save_feed_schedule(conn, feed_url, st)
+        schedule_saved = True
+        if retry_feeds:
+            log(f"Teslim edilmeyen/bütçe dışı haber: {len(retry_feeds)} feed sonraki yoklamada tam çekilecek")
+        prune_article_cache(conn)
+        stage_done("db", t0)
+
+        log(f"Değişmeyen feed (304/aynı içerik): {unchanged}/{len(catalog)}")
+        log("Elenen (aşama): " + " ".join(f"{k}={drops[k]}" for k in DROP_STAGES)
+            + f" | makale çekilen: {fetched} (önbellek: {article_hits})")
+        log(f"Gönderilen yeni özet: {sent_total}"
+            + (f" ({len(deliveries)} mesajda)" if DIGEST_MODE else "")
+            + (f" | hedef teslimi: {len(sent_pairs)}" if ROUTES else ""))
     except Exception as e:
+        error = e
         log(f"run_once beklenmeyen hata: {e}")
-        ping_healthcheck("fail")
+        METRICS.inc("newsbot_errors_total", where="run_once")
+        # plan yazılmadan kalırsa daemon bütün feed'leri birkaç saniyede bir yeniden
+        # dener: denenen feed'ler hata geri çekilmesiyle (doğrulayıcısız) ertelenir
+        if not schedule_saved:
+            try:
+                with conn:
+                    for feed_url in catalog:
+                        save_feed_schedule(conn, feed_url, schedule_after_poll(schedule.get(feed_url), started, "error"))
+            except Exception as e2:
+                log(f"Feed planı yazılamadı: {e2}")
+
+    # --- Ölçümler: koşu özeti (log + JSON + Prometheus) ve healthcheck gövdesi ---
+    duration = time.perf_counter() - t_cycle
+    METRICS.observe("newsbot_stage_seconds", duration, stage="cycle")
+    for stage, n in drops.items():
+        METRICS.inc("newsbot_dropped_total", n, stage=stage)
+    for stage, n in (("entries", entries), ("fresh", len(fresh)),
+                     ("candidates", len(candidates)), ("sent", sent_total)):
+        METRICS.inc("newsbot_items_total", n, stage=stage)
+    METRICS.set("newsbot_last_cycle_timestamp_seconds", int(started))
+    METRICS.set("newsbot_last_cycle_ok", 0 if error else 1)
+    summary = {
+        "ts": int(started), "ok": error is None, "duration_s": round(duration, 3),
+        "feeds": len(catalog), "feeds_unchanged": unchanged, "feed_errors": feed_errors,
+        "feeds_retry": len(retry_feeds),
+        "entries": entries, "fresh": len(fresh), "candidates": len(candidates), "sent": sent_total,
+        "deliveries": len(sent_pairs), "rejected": len(rejected_pairs),
+        "articles_fetched": fetched, "article_cache_hits": article_hits,
+        "dropped": {k: drops[k] for k in DROP_STAGES if drops[k]},
+        "stage_seconds": stage_secs,
+    }
+    if error is not None:
+        summary["error"] = str(error)[:500]
+    brief = json.dumps(summary, ensure_ascii=False)
+    log(f"Koşu özeti: {brief}")
+    METRICS.export({**summary, **METRICS.cycle_summary()})
+    ping_healthcheck("fail" if error is not None else "", brief)
+    return error is None
 
 def main():
-    if os.getenv("GITHUB_ACTIONS", "").lower() == "true":
-        run_once()
-        return
-    if INTERVAL_SECONDS <= 0:
-        run_once()
-        return
-    log(f"Başladı. Her {INTERVAL_SECONDS} sn’de bir kontrol edilecek.")
-    while True:
-        run_once()
-        time.sleep(INTERVAL_SECONDS)
+    if "--setup" in sys.argv[1:]:
+        sys.exit(0 if setup_nlp() else 1)
+    startup = time.perf_counter() - _T_START
+    METRICS.set("newsbot_startup_seconds", round(startup, 4))
+    log(f"Açılış: {startup * 1000:.0f} ms")
+    try:
+        if os.getenv("GITHUB_ACTIONS", "").lower() == "true":
+            # taze runner: dedupe durumu seen.db'de değil, önbelleğe alınan dosyada
+            if STATE_SNAPSHOT_PATH:
+                load_state_snapshot()
+            run_once()
+            if STATE_SNAPSHOT_PATH:
+                save_state_snapshot(get_db())
+            # seen.db runner'la birlikte atılır: sıkıştırma yok (saklama süreleri anlık görüntüde)
+            return
+        # GH Actions'ta --setup adımı var; daemon/yerel kurulumda veri burada kontrol edilir
+        ensure_nlp()
+        if INTERVAL_SECONDS <= 0:
+            run_once()
+            maybe_compact_db()
+            return
+        log(f"Başladı. Feed'ler {POLL_MIN_SECONDS}-{POLL_MAX_SECONDS} sn aralıkla, "
+            f"yayın sıklığına göre yoklanacak.")
+        feed_urls = list(build_feed_catalog())
+        while True:
+            ok = True
+            due = due_feeds(load_feed_schedule(get_db()), feed_urls, slack=POLL_GROUP_SLACK_SECONDS)
+            if due:
+                log(f"Yoklanan feed: {len(due)}/{len(feed_urls)}")
+                ok = run_once(due, digest_window=DIGEST_WINDOW_SECONDS)
+            elif DIGEST_MODE and digest_seconds_left() <= 0:
+                ok = run_once([], digest_window=DIGEST_WINDOW_SECONDS)   # sadece bekleyen özeti gönder
+            maybe_compact_db()
+            wait = min(seconds_until_due(load_feed_schedule(get_db()), feed_urls),
+                       digest_seconds_left() if DIGEST_MODE else float("inf"))
+            wait = min(max(wait, 5), POLL_MAX_SECONDS)
+            # hatalı koşudan sonra (plan yazılamamış olabilir) en az INTERVAL_SECONDS beklenir
+            time.sleep(wait if ok else max(wait, INTERVAL_SECONDS))
+    finally:
+        close_tg_deliveries()
+        shutdown_summary_pool()
+        close_db()
 
 if __name__ == "__main__":
     main()
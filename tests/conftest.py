@@ -0,0 +1,34 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench  # noqa: E402
+import main   # noqa: E402
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: uzun süren testler (-m 'not slow' ile atlanır)")
+
+
+def cycle() -> dict:
+    """Bir run_once koşusu; dönüş: koşu özeti (METRICS_JSON_PATH)."""
+    main.run_once()
+    with open(main.METRICS_JSON_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    """3 feed x 4 haber sunan yerel ReplayServer; ağ, çeviri ve DB geçici ortamda."""
+    monkeypatch.setattr(main, "TG_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(main, "SUMMARY_WORKERS", 0)
+    server = bench.ReplayServer(bench.SyntheticFixtures(4))
+    try:
+        with bench.replay_env(server, 3, 8):
+            yield server
+    finally:
+        server.close()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Yalın makale yolu: akışlı HTML ayrıştırma, erken durma, kanonik + ana metin."""
+
+import main
+
+PARA = "<p>" + "A reasonably long sentence about streamers and their platforms. " * 4 + "</p>"
+PAGE = ("<html><head><title>t</title><link rel='canonical' href='/canon'></head><body>"
+        "<nav><p>menu menu menu menu menu menu menu menu menu menu</p></nav>"
+        f"<article>{PARA * 6}</article>"
+        + "<div class='related'>" + "<p>related story teaser text that is long enough</p>" * 500 + "</div>"
+        "</body></html>").encode("utf-8")
+
+
+def feed(stream, data, size=512):
+    """Parçaları verir; stream durmak isterse okunan bayt sayısını döndürür."""
+    for i in range(0, len(data), size):
+        if stream(data[i:i + size], "utf-8"):
+            return i + size
+    return len(data)
+
+
+def test_stops_after_article_and_extracts():
+    stream = main.HtmlStream()
+    read = feed(stream, PAGE)
+    assert read < len(PAGE) // 4
+    doc = stream.close()
+    assert main.extract_canonical(doc, "https://h.com/x") == "https://h.com/canon"
+    text = main.extract_main_text(doc)
+    assert text.count("streamers") == 24 and "menu" not in text
+
+
+def test_reads_whole_page_without_enough_text():
+    page = b"<html><head></head><body><article><p>short</p></article><div>" + b"x" * 5000 + b"</div></body></html>"
+    stream = main.HtmlStream()
+    assert feed(stream, page) == len(page)
+    assert main.extract_main_text(stream.close()) == ""
+
+
+def test_empty_body_has_no_document():
+    assert main.HtmlStream().close() is None
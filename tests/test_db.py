@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""DB sıkıştırma zamanlaması: son sıkıştırma DB'de tutulur."""
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_PATH", str(tmp_path / "seen.db"))
+    main.close_db()
+    yield
+    main.close_db()
+
+
+def test_compaction_interval_survives_restart(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "compact_db", lambda conn: calls.append(conn))
+    now = [1_700_000_000]
+    monkeypatch.setattr(main.time, "time", lambda: now[0])
+
+    main.maybe_compact_db()          # yeni DB: süre başlar, sıkıştırma yok
+    main.close_db()                  # tek koşuluk çalıştırma: süreç biter
+    now[0] += 3600
+    main.maybe_compact_db()
+    assert calls == []
+
+    main.close_db()
+    now[0] += main.COMPACT_INTERVAL_HOURS * 3600
+    main.maybe_compact_db()
+    main.maybe_compact_db()
+    assert len(calls) == 1
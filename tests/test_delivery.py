@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Teslim edilemeyen haberin sonraki koşuda (sadece eksik hedefe) tekrar denenmesi."""
+
+from conftest import cycle
+
+import main
+
+
+def test_failed_send_is_retried_next_cycle(replay):
+    replay.tg_fail = {"0"}
+    first = cycle()
+    assert first["sent"] == 0 and first["feeds_retry"] == 3
+
+    replay.tg_fail = set()
+    second = cycle()
+    assert second["sent"] == 12 and second["feeds_unchanged"] == 0
+
+    third = cycle()
+    assert third["sent"] == 0 and third["feeds_unchanged"] == 3
+
+
+def test_failed_route_is_retried_only_for_that_chat(replay, monkeypatch):
+    monkeypatch.setattr(main, "ROUTES", [{"chat_ids": ["A", "B"]}])
+    replay.tg_fail = {"B"}
+    first = cycle()
+    assert (first["sent"], first["deliveries"], first["feeds_retry"]) == (0, 12, 3)
+
+    replay.tg_fail = set()
+    second = cycle()
+    assert (second["sent"], second["deliveries"]) == (12, 12)
+    assert replay.tg_messages == 24   # A'ya ikinci kez gitmedi
+
+    rows = dict(main.get_db().execute("SELECT chat_id, COUNT(*) FROM delivered GROUP BY chat_id"))
+    assert rows == {"A": 12, "B": 12}
+    assert cycle()["feeds_unchanged"] == 3
+
+
+def test_over_budget_items_are_carried_over(replay, monkeypatch):
+    monkeypatch.setattr(main, "CYCLE_SEND_BUDGET", 5)
+    assert [cycle()["sent"] for _ in range(3)] == [5, 5, 2]
+    assert cycle()["feeds_unchanged"] == 3
+
+
+def test_rejected_route_is_not_retried(replay, monkeypatch):
+    monkeypatch.setattr(main, "ROUTES", [{"chat_ids": ["A", "B"]}])
+    replay.tg_reject = {"B"}
+    first = cycle()
+    assert (first["sent"], first["deliveries"], first["rejected"]) == (12, 12, 12)
+    assert first["feeds_retry"] == 0
+
+    replay.tg_reject = set()
+    assert cycle()["feeds_unchanged"] == 3
+    assert replay.tg_messages == 12   # B'ye tekrar denenmedi
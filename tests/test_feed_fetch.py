@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Feed indirme: toplam süre sınırı (yavaş damlayan sunucu)."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import main
+
+
+class DripHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "100000")
+        self.end_headers()
+        try:
+            self.wfile.write(b'<?xml version="1.0"?><rss version="2.0"><channel>')
+            for _ in range(100):   # okuma zaman aşımına hiç takılmayan hızda
+                self.wfile.write(b" ")
+                self.wfile.flush()
+                time.sleep(0.1)
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def drip_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DripHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed"
+    server.shutdown()
+    server.server_close()
+
+
+def test_slow_feed_hits_total_deadline(drip_url, monkeypatch):
+    monkeypatch.setattr(main, "FEED_DEADLINE_SECONDS", 0.5)
+    t0 = time.monotonic()
+    with pytest.raises(TimeoutError):
+        main.fetch_feed(drip_url)
+    assert time.monotonic() - t0 < 3
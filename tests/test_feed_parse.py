@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Akışlı feed ayrıştırıcı: RSS 2.0 / RSS 1.0 (RDF) / Atom, erken durma ve feedparser'a düşüş."""
+
+import email.utils
+
+import feedparser
+import pytest
+
+import main
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>X</title>
+<item><title>MrBeast &lt;b&gt;deal&lt;/b&gt;</title><link>https://x.com/a?b=1</link><pubDate>Tue, 10 Jun 2025 12:00:00 +0200</pubDate></item>
+<item><title>Two</title><guid>https://x.com/g2</guid><dc:date>2025-06-10T09:00:00Z</dc:date></item>
+<item><title>Three</title><link>https://x.com/3</link></item>
+</channel></rss>"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>R</title></channel>
+<item><title>R1</title><link>https://r.com/1</link><dc:date>2025-06-10T10:00:00+00:00</dc:date></item>
+</rdf:RDF>"""
+
+ATOM = b"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>A</title>
+<entry><title>Hello</title><link rel="enclosure" href="/e.mp3"/><link rel="alternate" href="/p/1"/>
+<published>2025-06-10T10:00:00+01:00</published><updated>2025-06-11T10:00:00Z</updated></entry>
+<entry><title>B</title><link href="https://a.com/2"/><updated>2025-06-10T07:00:00Z</updated></entry>
+</feed>"""
+
+
+def as_tuples(entries):
+    return [(e.link, e.title, e.ts) for e in entries]
+
+
+def reference(data, base):
+    d = feedparser.parse(data, response_headers={"content-location": base})
+    return [(e.get("link", ""), e.get("title"), main.entry_unix_ts(e)) for e in d.entries]
+
+
+@pytest.mark.parametrize("data, base", [
+    (RSS, "https://x.com/feed"),
+    (RDF, "https://r.com/"),
+    (ATOM, "https://a.com/feed"),
+])
+def test_stream_matches_feedparser(data, base):
+    entries = main.parse_feed_stream(data, base)
+    assert as_tuples(entries) == reference(data, base)
+
+
+def test_atom_alternate_link_is_resolved():
+    first = main.parse_feed_stream(ATOM, "https://a.com/feed")[0]
+    assert first.link == "https://a.com/p/1"
+    assert first.ts == main.parse_feed_date("2025-06-10T09:00:00Z")
+
+
+def test_unknown_entity_falls_back_to_feedparser():
+    bad = RSS.replace(b"<title>Two", b"<title>Two&nbsp;")
+    with pytest.raises(Exception):
+        main.parse_feed_stream(bad, "https://x.com/feed")
+    assert as_tuples(main.parse_feed_entries(bad, "https://x.com/feed")) == reference(bad, "https://x.com/feed")
+
+
+def test_unknown_root_is_rejected():
+    with pytest.raises(ValueError):
+        main.parse_feed_stream(b"<html><body>x</body></html>", "https://x.com/")
+
+
+def rss_chunks(n, step, now=1_700_000_000):
+    """Girişleri (yeniden eskiye, step sn arayla) ayrı parçalar halinde üretir; okunanları sayar."""
+    read = []
+
+    def gen():
+        yield b'<?xml version="1.0"?><rss version="2.0"><channel><title>S</title>'
+        for j in range(n):
+            read.append(j)
+            stamp = email.utils.formatdate(now - step * j)
+            yield f"<item><title>T{j}</title><link>https://s.com/{j}</link><pubDate>{stamp}</pubDate></item>".encode()
+        yield b"</channel></rss>"
+    return gen(), read
+
+
+def test_stops_reading_at_limit():
+    chunks, read = rss_chunks(50, 60)
+    entries = main.parse_feed_entries(chunks, "https://s.com/", limit=4)
+    assert [e.title for e in entries] == ["T0", "T1", "T2", "T3"]
+    assert len(read) == 4
+
+
+def test_stale_stop_keeps_gap_sample(monkeypatch):
+    monkeypatch.setattr(main, "FEED_GAP_SAMPLE", 5)
+    now = 1_700_000_000
+    chunks, read = rss_chunks(50, 600, now)
+    entries = main.parse_feed_stream(chunks, "https://s.com/", since=now - 900, limit=20)
+    # ikinci giriş zaten eski ama aralık tahmini için 5 zaman okunur
+    assert len(entries) == 5 and len(read) == 5
+
+
+def test_unordered_feed_is_not_cut_at_stale_entry():
+    now = 1_700_000_000
+    body = b'<rss version="2.0"><channel>' + b"".join(
+        f"<item><title>T{j}</title><link>https://s.com/{j}</link>"
+        f"<pubDate>{email.utils.formatdate(now - ts)}</pubDate></item>".encode()
+        for j, ts in enumerate((0, 5000, 10, 6000, 7000, 8000, 20))
+    ) + b"</channel></rss>"
+    entries = main.parse_feed_stream(body, "https://s.com/", since=now - 900)
+    assert len(entries) == 7
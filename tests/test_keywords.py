@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Keyword eşleştirici: kelime başına re.search döngüsüyle aynı sonuç."""
+
+import re
+
+import pytest
+
+import main
+
+TITLES = [
+    "TARTIŞMA BÜYÜYOR: YAYINCI KAVGASI GÜNDEM OLDU",
+    "Yeni AKIM sosyal medyayı sardı",
+    "TIKLANMA rekoru kırıldı",
+    "Ünlü isme YAYIN YASAĞI geldi",
+    "Video SIZDIRILDI, İZLENME patladı",
+    "İçerik üretici kampanyası",
+    "Top content creator signs exclusive deal with Kick",
+    "xQc reacts to the MrBeast controversy",
+    "Kai Cenat breaks Twitch subscriber record",
+    "Kickstarter for a new board game",
+    "Streamers react",
+    "ban hammer falls",
+    "",
+]
+
+
+def old_matches(text, keywords):
+    return [kw for kw in keywords if re.search(r"\b" + re.escape(kw) + r"\b", text, re.IGNORECASE)]
+
+
+@pytest.mark.parametrize("title", TITLES)
+@pytest.mark.parametrize("keywords", [main.GLOBAL_KEYWORDS, main.CORE_KEYWORDS])
+def test_matcher_agrees_with_per_keyword_loop(title, keywords):
+    expected = old_matches(title, keywords)
+    assert main.text_matches_keywords_whole_words(title, keywords) == bool(expected)
+    assert set(main.keyword_hits(title, keywords)) == {main.fold_text(kw) for kw in expected}
+
+
+def test_upper_case_turkish_keywords_match():
+    for title, kw in [("TARTIŞMA ÇIKTI", "tartışma"), ("YENİ AKIM", "akım"),
+                      ("TIKLANMA REKORU", "tıklanma"), ("YAYIN YASAĞI GELDİ", "yayın yasağı"),
+                      ("GÖRÜNTÜLER SIZDIRILDI", "sızdırıldı")]:
+        assert main.text_matches_keywords_whole_words(title, [kw]), title
+        assert main.keyword_hits(title, [kw]) == [kw]
+
+
+def test_nested_hits_return_the_keywords_themselves():
+    hits = main.keyword_hits("Top CONTENT CREATOR deal", ["creator", "content creator", "deal"])
+    assert hits == ["content creator", "creator", "deal"]
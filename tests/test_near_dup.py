@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Yakın-kopya başlık indeksi (MinHash + LSH): koşu içi sahip ve seen.db kayıtları."""
+
+import pytest
+
+import main
+
+TITLE = "MrBeast announces record breaking charity stream with xQc"
+SIMILAR = "MrBeast announces record-breaking charity stream alongside xQc"
+OTHER = "Pokimane launches new cooking channel on YouTube Shorts"
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_PATH", str(tmp_path / "seen.db"))
+    conn = main.init_db()
+    yield conn
+    conn.close()
+
+
+def test_signature_needs_three_meaningful_words():
+    assert main.near_dup_signature("the new xQc") is None
+    sig = main.near_dup_signature(TITLE)
+    assert len(sig) == main.NEAR_DUP_BANDS * main.NEAR_DUP_ROWS
+    assert sig == main.near_dup_signature(TITLE.upper())
+
+
+def test_similarity_separates_rewrites_from_other_stories():
+    sig = main.near_dup_signature(TITLE)
+    assert main.near_dup_similarity(sig, main.near_dup_signature(SIMILAR)) >= main.NEAR_DUP_MIN_SIMILARITY
+    assert main.near_dup_similarity(sig, main.near_dup_signature(OTHER)) < main.NEAR_DUP_MIN_SIMILARITY
+
+
+def test_run_local_match_returns_owner():
+    index = main.NearDupIndex(None)
+    owner = {"title": TITLE}
+    index.add(main.near_dup_signature(TITLE), owner)
+    assert index.match(main.near_dup_signature(SIMILAR)) == (True, owner)
+    assert index.match(main.near_dup_signature(OTHER)) == (False, None)
+    assert index.match(None) == (False, None)
+
+
+def test_db_match_wins_over_run_owner(conn):
+    with conn:
+        main.mark_near_dup(conn, main.near_dup_signature(TITLE))
+    index = main.NearDupIndex(conn)
+    index.add(main.near_dup_signature(TITLE), {"title": TITLE})
+    assert index.match(main.near_dup_signature(SIMILAR)) == (True, None)
+
+
+def test_db_records_expire(conn):
+    old = main.time.time() - main.NEAR_DUP_TTL_HRS * 3600 - 60
+    with conn:
+        main.mark_near_dup(conn, main.near_dup_signature(TITLE), old)
+    assert not main.NearDupIndex(conn).is_dup(main.near_dup_signature(SIMILAR))
+
+
+def test_disabled_by_zero_threshold(monkeypatch):
+    monkeypatch.setattr(main, "NEAR_DUP_MIN_SIMILARITY", 0)
+    index = main.NearDupIndex(None)
+    index.add(main.near_dup_signature(TITLE))
+    assert not index.is_dup(main.near_dup_signature(TITLE))
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Öncelik puanı: keyword ağırlıkları, GLOBAL tavanı, tazelik, yayıncı ve teyit."""
+
+import main
+
+NOW = 1_700_000_000
+
+
+def test_each_keyword_counts_once():
+    scorer = main.keyword_scorer([])
+    assert scorer.score("xQc drama") == main.SCORE_CORE_WEIGHT + main.SCORE_GLOBAL_WEIGHT
+    assert scorer.score("xQc xQc drama drama") == scorer.score("xQc drama")
+    assert scorer.score("nothing relevant") == 0
+
+
+def test_keyword_weights_override_defaults():
+    assert main.keyword_scorer([]).score("twitch") == main.KEYWORD_WEIGHTS["twitch"]
+
+
+def test_global_keywords_are_capped_but_core_is_not():
+    scorer = main.keyword_scorer([])
+    stuffed = scorer.score("xQc drama backlash controversy viral leak apology")
+    assert stuffed == main.SCORE_CORE_WEIGHT + main.SCORE_GLOBAL_CAP
+    # iki CORE isim, GLOBAL kelime yığınından önde
+    assert scorer.score("xQc MrBeast") >= stuffed
+
+
+def test_category_keywords_and_scorer_cache():
+    assert main.keyword_scorer(["valorant"]).score("xQc valorant") > main.keyword_scorer([]).score("xQc valorant")
+    assert main.keyword_scorer(["valorant"]) is main.keyword_scorer(("valorant",))
+
+
+def test_fresh_items_rank_higher():
+    fresh = main.priority_score("xQc drama", [], "x.com", NOW, now=NOW)
+    half = main.priority_score("xQc drama", [], "x.com", NOW - main.SCORE_FRESH_HALF_LIFE_MINUTES * 60, now=NOW)
+    undated = main.priority_score("xQc drama", [], "x.com", None, now=NOW)
+    assert fresh - undated == main.SCORE_FRESH_WEIGHT
+    assert half - undated == main.SCORE_FRESH_WEIGHT / 2
+
+
+def test_publisher_weight_and_corroboration_cap():
+    base = main.priority_score("xQc drama", [], "x.com", None, now=NOW)
+    assert main.priority_score("xQc drama", [], "Dexerto", None, now=NOW) == base + main.PUBLISHER_WEIGHTS["Dexerto"]
+    capped = main.priority_score("xQc drama", [], "x.com", None, main.SCORE_CORROBORATION_MAX + 5, now=NOW)
+    assert capped == base + main.SCORE_CORROBORATION_WEIGHT * main.SCORE_CORROBORATION_MAX
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Depodaki kayıtlı fixture'larla (tests/fixtures/replay) run_once uçtan uca."""
+
+import argparse
+
+import pytest
+
+from conftest import cycle
+
+import bench
+import main
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    monkeypatch.setattr(main, "TG_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(main, "SUMMARY_WORKERS", 0)
+    fixtures = bench.RecordedFixtures(bench.RECORDED_FIXTURES)
+    server = bench.ReplayServer(fixtures)
+    try:
+        with bench.replay_env(server, len(fixtures.feeds), 8):
+            yield server
+    finally:
+        server.close()
+
+
+def test_recorded_fixtures_are_delivered_once(recorded):
+    first = cycle()
+    assert first["feed_errors"] == 0
+    assert first["sent"] == len(recorded.fixtures.articles) == recorded.tg_messages
+    assert cycle()["feeds_unchanged"] == len(recorded.fixtures.feeds)
+
+
+@pytest.mark.slow
+def test_soak_rss_growth_is_bounded(monkeypatch, capsys):
+    monkeypatch.setattr(main, "SUMMARY_WORKERS", 0)
+    fixtures = bench.RecordedFixtures(bench.RECORDED_FIXTURES)
+    args = argparse.Namespace(fixtures=bench.RECORDED_FIXTURES, cycles=30, feeds=len(fixtures.feeds) * 4,
+                              items=0, seed=1, translate_latency=0.0, per_host=8,
+                              max_growth_mb=20.0, tracemalloc=False)
+    assert bench.bench_soak(args) == 0, capsys.readouterr().out
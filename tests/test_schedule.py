@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Feed yoklama planı: aralık/geri çekilme ve tazelik kapısı."""
+
+import main
+from conftest import cycle
+
+NOW = 1_700_000_000
+
+
+def test_new_feed_starts_at_interval_and_learns_gap():
+    st = main.schedule_after_poll(None, NOW, "ok", [NOW - 600 * k for k in range(5)])
+    assert st["gap"] == 600 and st["errors"] == 0 and st["last_ok"] == NOW
+    assert st["interval"] == 600 * main.POLL_GAP_FACTOR
+    assert st["next_poll"] == main.poll_tick(NOW + st["interval"])
+
+
+def test_interval_is_clamped():
+    busy = main.schedule_after_poll(None, NOW, "ok", [NOW - 5 * k for k in range(10)])
+    assert busy["interval"] == main.POLL_MIN_SECONDS
+    quiet = main.schedule_after_poll(None, NOW, "ok", [NOW - 86400])
+    assert quiet["interval"] == main.POLL_MAX_SECONDS
+
+
+def test_unchanged_slows_down_and_error_backs_off():
+    st = main.schedule_after_poll(None, NOW, "ok", [NOW - 600 * k for k in range(5)])
+    slower = main.schedule_after_poll(st, NOW, "unchanged")
+    assert slower["interval"] == int(st["interval"] * 1.25)
+
+    err = main.schedule_after_poll(st, NOW, "error")
+    err2 = main.schedule_after_poll(err, NOW, "error")
+    assert (err["errors"], err2["errors"]) == (1, 2)
+    assert err["last_ok"] == NOW   # hata son başarılı yoklamayı ilerletmez
+    assert NOW < err["next_poll"] < err2["next_poll"] <= NOW + main.POLL_BACKOFF_MAX_SECONDS
+
+
+def test_next_poll_is_rounded_to_tick():
+    tick = main.POLL_TICK_SECONDS
+    assert main.poll_tick(NOW) % tick == 0
+    assert 0 <= main.poll_tick(NOW) - NOW < tick
+    assert main.poll_tick(10 * tick) == 10 * tick
+
+
+def test_due_feeds_groups_polls_within_slack():
+    schedule = {"a": {"next_poll": NOW - 1}, "b": {"next_poll": NOW + 60}, "c": {"next_poll": NOW + 3600}}
+    assert main.due_feeds(schedule, ["a", "b", "c"], NOW, slack=120) == ["a", "b"]
+    assert main.due_feeds(schedule, ["a", "b", "c"], NOW) == ["a"]
+    # hiçbiri gelmediyse slack tek başına yoklama başlatmaz
+    assert main.due_feeds(schedule, ["b", "c"], NOW, slack=120) == []
+    assert main.due_feeds(schedule, ["new", "c"], NOW, slack=120) == ["new"]
+
+
+def test_fresh_since_bounds():
+    assert main.feed_fresh_since(None, NOW) == NOW - main.FRESH_ONLY_MINUTES * 60
+    recent = {"last_ok": NOW - 60}
+    assert main.feed_fresh_since(recent, NOW) == NOW - main.FRESH_ONLY_MINUTES * 60
+    older = {"last_ok": NOW - 3600}
+    assert main.feed_fresh_since(older, NOW) == NOW - 3600 - main.FRESH_GRACE_SECONDS
+    ancient = {"last_ok": NOW - 7 * 86400}
+    assert main.feed_fresh_since(ancient, NOW) == NOW - main.FRESH_MAX_LOOKBACK_HOURS * 3600
+
+
+def test_failed_cycle_backs_off_attempted_feeds(replay, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(main, "fetch_feeds", broken)
+    summary = cycle()
+    assert not summary["ok"]
+    schedule = main.load_feed_schedule(main.get_db())
+    assert len(schedule) == 3
+    assert all(st["errors"] == 1 for st in schedule.values())
+    assert main.due_feeds(schedule, list(schedule)) == []
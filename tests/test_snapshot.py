@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Taşınabilir dedupe durumu: link/başlık/yakın-kopya/teslim kayıtları koşudan koşuya."""
+
+import struct
+import time
+import zlib
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """Her çağrı yeni bir runner gibi boş seen.db açar."""
+    monkeypatch.setattr(main, "_state_snapshot", None)
+    n = [0]
+
+    def open_db():
+        main.close_db()
+        n[0] += 1
+        monkeypatch.setattr(main, "DB_PATH", str(tmp_path / f"seen{n[0]}.db"))
+        return main.get_db()
+
+    yield open_db
+    main.close_db()
+
+
+def test_round_trip_keeps_near_dup_and_delivered(fresh_db, tmp_path):
+    path = str(tmp_path / "state.snap")
+    title = "MrBeast announces record breaking charity stream with xQc"
+    conn = fresh_db()
+    main.load_state_snapshot(path)
+    item = {"id": "i1", "title": title, "link": "https://a.com/1", "norm_link": "https://a.com/1",
+            "category": "GLOBAL", "pub": "a.com", "t_fp2": main.title_fp2(title),
+            "near_sig": main.near_dup_signature(title)}
+    main.mark_delivered(conn, [item], [("chat-A", item["link"])])
+    main.save_state_snapshot(conn, path)
+
+    conn = fresh_db()
+    snap = main.load_state_snapshot(path)
+    assert (len(snap.links), len(snap.titles), len(snap.near), len(snap.delivered)) == (1, 1, 1, 1)
+    links, _, _ = main.lookup_seen(conn, links=[item["link"]])
+    assert links == {item["link"]}
+    similar = main.near_dup_signature("MrBeast announces record-breaking charity stream alongside xQc")
+    assert main.NearDupIndex(conn).is_dup(similar)
+    got = main.delivered_targets(conn, [item["link"]], {"chat-A", "chat-B"})
+    assert got == {item["link"]: {"chat-A"}}
+
+    # ikinci koşu: geri yüklenen imzalar DB'de çoğaltılmaz, dosya aynı kalır
+    main.save_state_snapshot(conn, path)
+    assert len(main.load_state_snapshot(path).near) == 1
+    assert conn.execute("SELECT COUNT(*) FROM near_dup").fetchone()[0] == 1
+
+
+def test_reads_version_1_file(fresh_db, tmp_path):
+    now = int(time.time())
+    link_h = main.StateSnapshot.key("https://a.com/1")
+    body = main._SNAP_RECORD.pack(link_h, now) + main._SNAP_RECORD.pack(7, now)
+    data = struct.pack("<4sHII", b"NBST", 1, 1, 1) + zlib.compress(body)
+    path = tmp_path / "v1.snap"
+    path.write_bytes(data)
+    fresh_db()
+    snap = main.load_state_snapshot(str(path))
+    assert snap.has_link("https://a.com/1") and snap.titles == {7: now}
+    assert snap.near == {} and snap.delivered == {}
+
+
+def test_expired_records_are_dropped():
+    now = int(time.time())
+    sig = main._ND_STRUCT.pack(*main.near_dup_signature("Kai Cenat breaks Twitch subscriber record"))
+    snap = main.StateSnapshot(near={sig: now - int(main.NEAR_DUP_TTL_HRS * 3600) - 1},
+                              delivered={1: now, 2: now - 30 * 86400})
+    snap.prune(now)
+    assert snap.near == {} and snap.delivered == {1: now}
+    again = main.StateSnapshot.from_bytes(snap.to_bytes())
+    assert again.delivered == {1: now}
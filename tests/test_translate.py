@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Türkçe algılama ve arka uca bağlı çeviri önbelleği."""
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("text", [
+    "Galatasaray yeni transferini açıkladı ve taraftarlar çok mutlu",
+    "Bu yayın için bir sürpriz daha geldi",
+    "Şampiyonluk maçı İstanbul'da oynanacak",
+])
+def test_is_turkish_detects_turkish(text):
+    assert main.is_turkish(text)
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "MrBeast announces a new video after the stream",
+    "Kılıçdaroğlu says the party is ready for the election",
+    "xQc GTA RP",
+])
+def test_is_turkish_rejects_other_text(text):
+    assert not main.is_turkish(text)
+
+
+class UpperBackend:
+    def __init__(self, source="en", target="tr"):
+        pass
+
+    def translate(self, text):
+        return text.upper()
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_PATH", str(tmp_path / "seen.db"))
+    monkeypatch.setitem(main.TRANSLATE_BACKENDS, "google", UpperBackend)
+    conn = main.init_db()
+    yield conn
+    conn.close()
+
+
+def test_translation_key_depends_on_backend():
+    assert main.translation_key("x", backend="google") != main.translation_key("x", backend="offline")
+    assert main.translation_key("x", backend="offline") == main.translation_key("x", backend="offline")
+
+
+def test_offline_backend_does_not_poison_cache(conn, monkeypatch):
+    monkeypatch.setattr(main, "TRANSLATE_BACKEND", "offline")
+    assert main.translate_en_to_tr("hello world", conn=conn) == "hello world"
+
+    monkeypatch.setattr(main, "TRANSLATE_BACKEND", "google")
+    assert main.translate_en_to_tr("hello world", conn=conn) == "HELLO WORLD"
+    # ikinci çağrı önbellekten
+    monkeypatch.setitem(main.TRANSLATE_BACKENDS, "google", main.OfflineTranslateBackend)
+    assert main.translate_en_to_tr("hello world", conn=conn) == "HELLO WORLD"